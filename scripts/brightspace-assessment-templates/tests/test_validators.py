@@ -14,12 +14,15 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from validators import (
+    IMSCCValidator,
     AssignmentValidator,
     DiscussionValidator,
     QTIValidator,
     ManifestValidator,
     ValidationResult,
 )
+from validators.qti_validator import validate_many, validate_qti
+from validators.xml_validator import LXML_AVAILABLE, ValidationLevel
 
 
 class TestAssignmentValidator(unittest.TestCase):
@@ -193,6 +196,29 @@ class TestQTIValidator(unittest.TestCase):
         result = self.validator.validate(xml)
         self.assertTrue(result.is_valid, f"Errors: {result.errors}")
 
+    def test_wrong_namespace_short_circuits(self):
+        """Test that a namespace mismatch skips downstream structure checks."""
+        xml = '''<?xml version="1.0" encoding="UTF-8"?>
+<questestinterop xmlns="http://example.com/not-qti">
+  <assessment ident="test" title="Test"/>
+</questestinterop>'''
+        result = self.validator.validate(xml)
+        self.assertFalse(result.is_valid)
+        self.assertTrue(any("Namespace mismatch" in e for e in result.errors))
+        self.assertFalse(any("<assessment>" in e for e in result.errors))
+
+    def test_bytes_input(self):
+        """Test that encoded XML validates the same as a string."""
+        xml = '''<?xml version="1.0" encoding="UTF-8"?>
+<questestinterop xmlns="http://www.imsglobal.org/xsd/ims_qtiasiv1p2">
+  <assessment ident="test" title="Test">
+  </assessment>
+</questestinterop>'''
+        from_str = self.validator.validate(xml)
+        from_bytes = self.validator.validate(xml.encode('utf-8'))
+        self.assertEqual(from_str.errors, from_bytes.errors)
+        self.assertEqual(from_str.warnings, from_bytes.warnings)
+
     def test_missing_assessment(self):
         """Test detection of missing assessment element."""
         xml = '''<?xml version="1.0" encoding="UTF-8"?>
@@ -211,6 +237,148 @@ class TestQTIValidator(unittest.TestCase):
         result = self.validator.validate(xml)
         self.assertFalse(result.is_valid)
 
+    def test_item_metadata_fields(self):
+        """Test that item cc_profile and cc_weighting are both read from metadata."""
+        xml = '''<?xml version="1.0" encoding="UTF-8"?>
+<questestinterop xmlns="http://www.imsglobal.org/xsd/ims_qtiasiv1p2">
+  <assessment ident="test_quiz" title="Test Quiz">
+    <section ident="root_section">
+      <item ident="q1" title="Question 1">
+        <itemmetadata>
+          <qtimetadata>
+            <qtimetadatafield>
+              <fieldlabel>cc_profile</fieldlabel>
+              <fieldentry>cc.essay.v0p1</fieldentry>
+            </qtimetadatafield>
+            <qtimetadatafield>
+              <fieldlabel>cc_weighting</fieldlabel>
+              <fieldentry>ten</fieldentry>
+            </qtimetadatafield>
+          </qtimetadata>
+        </itemmetadata>
+        <presentation>
+          <material>
+            <mattext texttype="text/html">Question text</mattext>
+          </material>
+        </presentation>
+      </item>
+    </section>
+  </assessment>
+</questestinterop>'''
+        result = self.validator.validate(xml)
+        self.assertTrue(any("cc_weighting must be numeric" in e for e in result.errors))
+        self.assertTrue(any("requires response_str" in e for e in result.errors))
+
+    def test_validate_qti_cache_returns_copies(self):
+        """Test that cached validate_qti results cannot be mutated by callers."""
+        QTIValidator.clear_cache()
+        xml = '''<?xml version="1.0" encoding="UTF-8"?>
+<questestinterop xmlns="http://www.imsglobal.org/xsd/ims_qtiasiv1p2">
+</questestinterop>'''
+        first = validate_qti(xml)
+        first.errors.append("caller mutation")
+        second = validate_qti(xml)
+        self.assertFalse(second.is_valid)
+        self.assertNotIn("caller mutation", second.errors)
+        QTIValidator.clear_cache()
+
+    def test_item_and_identifier_issues(self):
+        """Test that item and identifier issues are both reported."""
+        xml = '''<?xml version="1.0" encoding="UTF-8"?>
+<questestinterop xmlns="http://www.imsglobal.org/xsd/ims_qtiasiv1p2">
+  <assessment ident="test_quiz" title="Test Quiz">
+    <section ident="root_section">
+      <item ident="q1" title="Question 1">
+        <presentation>
+          <material><mattext>First</mattext></material>
+        </presentation>
+      </item>
+      <item ident="q1" title="Question 2">
+        <presentation>
+          <material><mattext></mattext></material>
+        </presentation>
+      </item>
+    </section>
+  </assessment>
+</questestinterop>'''
+        result = self.validator.validate(xml)
+        self.assertTrue(any("Duplicate identifier found: 'q1'" in e for e in result.errors))
+        self.assertTrue(any("Item 2: Question text is empty" in e for e in result.errors))
+
+    def test_missing_assessment_still_checks_items(self):
+        """Test that a missing assessment does not skip item and identifier checks."""
+        xml = '''<questestinterop xmlns="http://www.imsglobal.org/xsd/ims_qtiasiv1p2">
+  <item ident="q1"><presentation><material><mattext>A</mattext></material></presentation></item>
+  <item ident="q1"><presentation><material><mattext>B</mattext></material></presentation></item>
+</questestinterop>'''
+        result = self.validator.validate(xml)
+        self.assertTrue(any("No <assessment> element found" in e for e in result.errors))
+        self.assertTrue(any("Duplicate identifier found: 'q1'" in e for e in result.errors))
+        self.assertTrue(any("Item 1: Missing itemmetadata" in w for w in result.warnings))
+
+    def test_validate_many_preserves_order(self):
+        """Test that batch validation returns one result per input, in order."""
+        valid_ns = '''<questestinterop xmlns="http://www.imsglobal.org/xsd/ims_qtiasiv1p2"/>'''
+        wrong_ns = '''<questestinterop xmlns="http://example.com/not-qti"/>'''
+        results = validate_many([valid_ns, wrong_ns, valid_ns], max_workers=2)
+        self.assertEqual(len(results), 3)
+        self.assertFalse(any("Namespace mismatch" in e for e in results[0].errors))
+        self.assertTrue(any("Namespace mismatch" in e for e in results[1].errors))
+
+    def test_unrecognized_item_profile(self):
+        """Test that only items with unknown cc_profile values are flagged."""
+        item = '''
+      <item ident="{ident}">
+        <itemmetadata><qtimetadata><qtimetadatafield>
+          <fieldlabel>cc_profile</fieldlabel><fieldentry>{profile}</fieldentry>
+        </qtimetadatafield></qtimetadata></itemmetadata>
+        <presentation><material><mattext>Text</mattext></material>
+          <response_str ident="r_{ident}"/></presentation>
+      </item>'''
+        xml = ('<questestinterop xmlns="http://www.imsglobal.org/xsd/ims_qtiasiv1p2">'
+               '<assessment ident="a" title="A"><section ident="s">'
+               + item.format(ident="q1", profile="cc.essay.v0p1")
+               + item.format(ident="q2", profile="cc.made_up.v0p1")
+               + '</section></assessment></questestinterop>')
+        result = self.validator.validate(xml)
+        flagged = [w for w in result.warnings if "Unrecognized cc_profile" in w]
+        self.assertEqual(flagged, ["Item 2: Unrecognized cc_profile 'cc.made_up.v0p1'"])
+
+    def test_item_profile_checked_on_reported_value(self):
+        """Test that the reported cc_profile is the one checked for membership."""
+        xml = ('<questestinterop xmlns="http://www.imsglobal.org/xsd/ims_qtiasiv1p2">'
+               '<assessment ident="a" title="A"><section ident="s">'
+               '<item ident="q1"><itemmetadata><qtimetadata>'
+               '<qtimetadatafield><fieldlabel>cc_profile</fieldlabel>'
+               '<fieldentry>{first}</fieldentry></qtimetadatafield>'
+               '<qtimetadatafield><fieldlabel>cc_profile</fieldlabel>'
+               '<fieldentry>{second}</fieldentry></qtimetadatafield>'
+               '</qtimetadata></itemmetadata>'
+               '<presentation><material><mattext>Text</mattext></material></presentation>'
+               '</item></section></assessment></questestinterop>')
+        result = self.validator.validate(xml.format(first="cc.essay.v0p1", second="bogus"))
+        self.assertFalse(any("Unrecognized cc_profile" in w for w in result.warnings))
+        self.assertTrue(any("cc.essay.v0p1 requires response_str" in e for e in result.errors))
+        result = self.validator.validate(xml.format(first="bogus", second="cc.essay.v0p1"))
+        self.assertIn("Item 1: Unrecognized cc_profile 'bogus'", result.warnings)
+
+    def test_repeated_item_metadata_label_uses_first_entry(self):
+        """Test that a repeated qtimetadatafield label resolves to its first entry."""
+        xml = ('<questestinterop xmlns="http://www.imsglobal.org/xsd/ims_qtiasiv1p2">'
+               '<assessment ident="a" title="A"><section ident="s">'
+               '<item ident="q1"><itemmetadata><qtimetadata>'
+               '<qtimetadatafield><fieldlabel>cc_weighting</fieldlabel>'
+               '<fieldentry>{first}</fieldentry></qtimetadatafield>'
+               '<qtimetadatafield><fieldlabel>cc_weighting</fieldlabel>'
+               '<fieldentry>{second}</fieldentry></qtimetadatafield>'
+               '</qtimetadata></itemmetadata>'
+               '<presentation><material><mattext>Text</mattext></material></presentation>'
+               '</item></section></assessment></questestinterop>')
+        result = self.validator.validate(xml.format(first="ten", second="5"))
+        self.assertTrue(any("cc_weighting must be numeric, got 'ten'" in e for e in result.errors))
+        result = self.validator.validate(xml.format(first="5", second="ten"))
+        self.assertFalse(any("cc_weighting must be numeric" in e for e in result.errors))
+
     def test_question_type_validation(self):
         """Test that question types are validated."""
         # Valid question types should be recognized
@@ -280,6 +448,38 @@ class TestManifestValidator(unittest.TestCase):
         self.assertIn("imsqti_xmlv1p2/imscc_xmlv1p3/assessment", valid_types)
 
 
+class TestSchemaCache(unittest.TestCase):
+    """Test shared XSD schema loading."""
+
+    @unittest.skipUnless(LXML_AVAILABLE, "lxml required for schema validation")
+    def test_schemas_shared_across_instances(self):
+        """Test that compiled schemas are reused by new validator instances."""
+        first = QTIValidator()
+        first._load_schemas()
+        second = QTIValidator()
+        self.assertIn('qti', second.schemas)
+        self.assertIs(first._get_schema('qti'), second._get_schema('qti'))
+
+
+class TestXMLEscaping(unittest.TestCase):
+    """Test XML escaping checks."""
+
+    def setUp(self):
+        self.validator = IMSCCValidator()
+
+    def test_escaped_content(self):
+        """Test that entities, comments and declarations are not flagged."""
+        xml = '<?xml version="1.0"?><a>&amp; &#38; &lt;<!-- note --></a>'
+        result = self.validator.check_xml_escaping(xml)
+        self.assertEqual(result.warnings, [])
+
+    def test_unescaped_characters(self):
+        """Test detection of bare ampersand and less-than."""
+        result = self.validator.check_xml_escaping('<a>Q&A < 5</a>')
+        self.assertIn('Unescaped ampersand (&) found', result.warnings)
+        self.assertIn('Potentially unescaped less-than (<) found', result.warnings)
+
+
 class TestValidationResult(unittest.TestCase):
     """Test ValidationResult class."""
 
@@ -308,6 +508,24 @@ class TestValidationResult(unittest.TestCase):
         self.assertTrue(result.is_valid)
         self.assertEqual(len(result.warnings), 1)
 
+    def test_error_formatting_and_merge(self):
+        """Test that errors are formatted with their level and survive merging."""
+        result = ValidationResult(is_valid=True)
+        other = ValidationResult(is_valid=True)
+        other.add_error("Bad value", ValidationLevel.MEDIUM)
+        result.merge(other)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.errors, ["[MEDIUM] Bad value"])
+
+    def test_errors_list_is_mutable_and_checked_for_critical(self):
+        """Test that errors is a real list and critical entries passed in are detected."""
+        result = ValidationResult(is_valid=False, errors=["[CRITICAL] Broken root"])
+        self.assertTrue(result.has_critical_errors())
+        result = ValidationResult(is_valid=True)
+        result.errors.append("[LOW] Appended directly")
+        self.assertEqual(result.errors, ["[LOW] Appended directly"])
+        self.assertFalse(result.has_critical_errors())
+
 
 if __name__ == '__main__':
     unittest.main()
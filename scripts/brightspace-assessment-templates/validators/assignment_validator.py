@@ -5,7 +5,7 @@ Validates IMSCC assignment XML files for correct format and Brightspace compatib
 """
 
 from typing import List, Optional
-from .xml_validator import IMSCCValidator, ValidationResult, ValidationLevel
+from .xml_validator import IMSCCValidator, ValidationResult, ValidationLevel, _PARSER, _as_bytes
 
 try:
     from lxml import etree
@@ -101,7 +101,7 @@ class AssignmentValidator(IMSCCValidator):
             return result
 
         try:
-            doc = etree.fromstring(xml_content.encode('utf-8'))
+            doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
             ns = {'a': self.ASSIGNMENT_NAMESPACE}
 
             # Check title is not empty
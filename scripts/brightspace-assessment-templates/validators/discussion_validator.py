@@ -5,7 +5,7 @@ Validates IMSCC discussion topic XML files for correct format and Brightspace co
 """
 
 from typing import List, Optional
-from .xml_validator import IMSCCValidator, ValidationResult, ValidationLevel
+from .xml_validator import IMSCCValidator, ValidationResult, ValidationLevel, _PARSER, _as_bytes
 
 try:
     from lxml import etree
@@ -92,7 +92,7 @@ class DiscussionValidator(IMSCCValidator):
 
         try:
             if LXML_AVAILABLE:
-                doc = etree.fromstring(xml_content.encode('utf-8'))
+                doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
                 local_name = etree.QName(doc.tag).localname
             else:
                 doc = etree.fromstring(xml_content)
@@ -131,7 +131,7 @@ class DiscussionValidator(IMSCCValidator):
             return result
 
         try:
-            doc = etree.fromstring(xml_content.encode('utf-8'))
+            doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
             ns = {'d': self.DISCUSSION_NAMESPACE}
 
             # Check title is not empty
@@ -6,7 +6,7 @@ Validates imsmanifest.xml files for correct format and Brightspace compatibility
 
 from typing import List, Dict, Set, Optional
 from pathlib import Path
-from .xml_validator import IMSCCValidator, ValidationResult, ValidationLevel
+from .xml_validator import IMSCCValidator, ValidationResult, ValidationLevel, _PARSER, _as_bytes
 
 try:
     from lxml import etree
@@ -102,7 +102,7 @@ class ManifestValidator(IMSCCValidator):
 
         try:
             if LXML_AVAILABLE:
-                doc = etree.fromstring(xml_content.encode('utf-8'))
+                doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
                 actual_ns = doc.nsmap.get(None, '')
             else:
                 doc = etree.fromstring(xml_content)
@@ -141,7 +141,7 @@ class ManifestValidator(IMSCCValidator):
 
         try:
             if LXML_AVAILABLE:
-                doc = etree.fromstring(xml_content.encode('utf-8'))
+                doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
             else:
                 doc = etree.fromstring(xml_content)
 
@@ -188,7 +188,7 @@ class ManifestValidator(IMSCCValidator):
 
         try:
             if LXML_AVAILABLE:
-                doc = etree.fromstring(xml_content.encode('utf-8'))
+                doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
             else:
                 doc = etree.fromstring(xml_content)
 
@@ -252,7 +252,7 @@ class ManifestValidator(IMSCCValidator):
 
         try:
             if LXML_AVAILABLE:
-                doc = etree.fromstring(xml_content.encode('utf-8'))
+                doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
             else:
                 doc = etree.fromstring(xml_content)
 
@@ -286,7 +286,7 @@ class ManifestValidator(IMSCCValidator):
 
         try:
             if LXML_AVAILABLE:
-                doc = etree.fromstring(xml_content.encode('utf-8'))
+                doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
             else:
                 doc = etree.fromstring(xml_content)
 
@@ -325,7 +325,7 @@ class ManifestValidator(IMSCCValidator):
 
         try:
             if LXML_AVAILABLE:
-                doc = etree.fromstring(xml_content.encode('utf-8'))
+                doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
             else:
                 doc = etree.fromstring(xml_content)
 
@@ -4,8 +4,13 @@ QTI Assessment XML Validator
 Validates IMSCC QTI 1.2 assessment XML files for correct format and Brightspace compatibility.
 """
 
-from typing import List, Optional, Set
-from .xml_validator import IMSCCValidator, ValidationResult, ValidationLevel
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from .xml_validator import IMSCCValidator, ValidationResult, ValidationLevel, _PARSER, _as_bytes
 
 try:
     from lxml import etree
@@ -14,6 +19,18 @@ except ImportError:
     LXML_AVAILABLE = False
     import xml.etree.ElementTree as etree
 
+if LXML_AVAILABLE:
+    # Elements carrying an ident attribute, selected inside libxml2
+    _XP_IDENT_ELEMENTS = etree.XPath('//*[@ident]')
+
+
+# Bounded cache of validate_qti() results keyed by a digest of the XML content.
+# Validation is a pure function of the content, so identical documents
+# re-validated across build steps are served from here.
+_RESULT_CACHE_SIZE = 128
+_RESULT_CACHE: 'OrderedDict[bytes, ValidationResult]' = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+
 
 class QTIValidator(IMSCCValidator):
     """
@@ -33,24 +50,24 @@ class QTIValidator(IMSCCValidator):
     QTI_NAMESPACE = 'http://www.imsglobal.org/xsd/ims_qtiasiv1p2'
 
     # Valid assessment profiles
-    VALID_ASSESSMENT_PROFILES = [
+    VALID_ASSESSMENT_PROFILES = frozenset({
         'cc.exam.v0p1',
         'cc.quiz.v0p1',
         'cc.survey.v0p1',
         'cc.graded_survey.v0p1',
-    ]
+    })
 
     # Valid question type profiles
-    VALID_QUESTION_PROFILES = [
+    VALID_QUESTION_PROFILES = frozenset({
         'cc.multiple_choice.v0p1',
         'cc.multiple_response.v0p1',
         'cc.true_false.v0p1',
         'cc.fib.v0p1',
         'cc.essay.v0p1',
-    ]
+    })
 
     # Valid assessment types
-    VALID_ASSESSMENT_TYPES = [
+    VALID_ASSESSMENT_TYPES = frozenset({
         'Examination',
         'Assessment',
         'Quiz',
@@ -58,47 +75,121 @@ class QTIValidator(IMSCCValidator):
         'Self-assessment',
         'Formative',
         'Summative',
-    ]
+    })
 
-    def validate(self, xml_content: str) -> ValidationResult:
+    # Question profiles answered through response_lid / response_str
+    _REQUIRES_RESPONSE_LID = frozenset({
+        'cc.multiple_choice.v0p1',
+        'cc.multiple_response.v0p1',
+        'cc.true_false.v0p1',
+    })
+    _REQUIRES_RESPONSE_STR = frozenset({
+        'cc.fib.v0p1',
+        'cc.essay.v0p1',
+    })
+
+    # Expected response_lid rcardinality per question profile
+    _EXPECTED_CARDINALITY = {
+        'cc.multiple_choice.v0p1': 'Single',
+        'cc.multiple_response.v0p1': 'Multiple',
+        'cc.true_false.v0p1': 'Single',
+    }
+
+    def validate(self, xml_content: Union[bytes, str]) -> ValidationResult:
         """
         Perform comprehensive validation of QTI assessment XML.
 
         Args:
-            xml_content: QTI XML string
+            xml_content: QTI XML string or UTF-8 bytes
 
         Returns:
             ValidationResult with all validation findings
         """
         result = ValidationResult(is_valid=True)
 
-        # Validate namespace
-        ns_result = self.validate_namespace(xml_content, 'qti')
-        result.merge(ns_result)
+        if not LXML_AVAILABLE:
+            return self._validate_without_lxml(xml_content)
 
-        # Validate root element
-        root_result = self.validate_root_element(xml_content, 'questestinterop')
+        # Parse once and run every check against the same tree
+        data = _as_bytes(xml_content)
+        try:
+            doc = etree.fromstring(data, _PARSER)
+        except Exception as e:
+            result.add_error(f"Failed to parse XML: {str(e)}", ValidationLevel.CRITICAL)
+            return result
+
+        # Validate namespace and root element.
+        # A wrong namespace or root means every q: lookup below would match
+        # nothing and only add spurious errors.
+        root_result = self._validate_root(doc)
         result.merge(root_result)
+        if root_result.has_critical_errors():
+            return result
 
         # Validate assessment structure
-        struct_result = self._validate_assessment_structure(xml_content)
-        result.merge(struct_result)
+        assessment = doc.find('q:assessment', {'q': self.QTI_NAMESPACE})
+        if assessment is None:
+            result.add_error("No <assessment> element found", ValidationLevel.CRITICAL)
+        else:
+            struct_result = self._check_assessment_structure(assessment)
+            result.merge(struct_result)
 
         # Validate question items
-        items_result = self._validate_question_items(xml_content)
+        items_result = self._check_question_items(doc)
         result.merge(items_result)
 
         # Validate identifiers
-        id_result = self._validate_identifiers(xml_content)
+        id_result = self._check_identifiers(doc)
         result.merge(id_result)
 
         # Schema validation
-        schema_result = self.validate_xml_string(xml_content, 'qti')
+        schema_result = self.validate_schema(doc, 'qti')
         result.merge(schema_result)
 
         return result
 
-    def _validate_assessment_structure(self, xml_content: str) -> ValidationResult:
+    def _validate_without_lxml(self, xml_content: Union[bytes, str]) -> ValidationResult:
+        """Run the checks available with the standard library parser."""
+        result = ValidationResult(is_valid=True)
+
+        ns_result = self.validate_namespace(xml_content, 'qti')
+        result.merge(ns_result)
+
+        root_result = self.validate_root_element(xml_content, 'questestinterop')
+        result.merge(root_result)
+
+        if ns_result.has_critical_errors() or root_result.has_critical_errors():
+            return result
+
+        result.merge(self._validate_assessment_structure(xml_content))
+        result.merge(self._validate_question_items(xml_content))
+        result.merge(self._validate_identifiers(xml_content))
+        result.merge(self.validate_xml_string(xml_content, 'qti'))
+
+        return result
+
+    def _validate_root(self, doc) -> ValidationResult:
+        """Validate namespace and root element of a parsed document."""
+        result = ValidationResult(is_valid=True)
+
+        expected_ns = self.NAMESPACES['qti']
+        actual_ns = doc.nsmap.get(None, '')
+        if actual_ns != expected_ns:
+            result.add_error(
+                f"Namespace mismatch: expected '{expected_ns}', got '{actual_ns}'",
+                ValidationLevel.CRITICAL
+            )
+
+        local_name = etree.QName(doc.tag).localname
+        if local_name != 'questestinterop':
+            result.add_error(
+                f"Root element mismatch: expected 'questestinterop', got '{local_name}'",
+                ValidationLevel.CRITICAL
+            )
+
+        return result
+
+    def _validate_assessment_structure(self, xml_content: Union[bytes, str]) -> ValidationResult:
         """Validate assessment-level structure."""
         result = ValidationResult(is_valid=True)
 
@@ -107,14 +198,25 @@ class QTIValidator(IMSCCValidator):
             return result
 
         try:
-            doc = etree.fromstring(xml_content.encode('utf-8'))
-            ns = {'q': self.QTI_NAMESPACE}
+            doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
+        except Exception as e:
+            result.add_error(f"Failed to validate structure: {str(e)}", ValidationLevel.HIGH)
+            return result
 
-            # Check for assessment element
-            assessment = doc.find('q:assessment', ns)
-            if assessment is None:
-                result.add_error("No <assessment> element found", ValidationLevel.CRITICAL)
-                return result
+        # Check for assessment element
+        assessment = doc.find('q:assessment', {'q': self.QTI_NAMESPACE})
+        if assessment is None:
+            result.add_error("No <assessment> element found", ValidationLevel.CRITICAL)
+            return result
+
+        return self._check_assessment_structure(assessment)
+
+    def _check_assessment_structure(self, assessment) -> ValidationResult:
+        """Validate ident, title, metadata and sections of a parsed assessment element."""
+        result = ValidationResult(is_valid=True)
+
+        try:
+            ns = {'q': self.QTI_NAMESPACE}
 
             # Check assessment has ident
             ident = assessment.get('ident')
@@ -144,12 +246,8 @@ class QTIValidator(IMSCCValidator):
 
     def _validate_assessment_metadata(self, metadata, ns: dict, result: ValidationResult):
         """Validate assessment-level metadata fields."""
-        fields = {}
-        for field in metadata.findall('q:qtimetadatafield', ns):
-            label = field.find('q:fieldlabel', ns)
-            entry = field.find('q:fieldentry', ns)
-            if label is not None and entry is not None:
-                fields[label.text] = entry.text
+        # A repeated label keeps its last entry here
+        fields = dict(self._iter_qtimetadata_fields(metadata, ns))
 
         # Check cc_profile
         if 'cc_profile' in fields:
@@ -175,7 +273,7 @@ class QTIValidator(IMSCCValidator):
                     ValidationLevel.MEDIUM
                 )
 
-    def _validate_question_items(self, xml_content: str) -> ValidationResult:
+    def _validate_question_items(self, xml_content: Union[bytes, str]) -> ValidationResult:
         """Validate individual question items."""
         result = ValidationResult(is_valid=True)
 
@@ -184,7 +282,18 @@ class QTIValidator(IMSCCValidator):
             return result
 
         try:
-            doc = etree.fromstring(xml_content.encode('utf-8'))
+            doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
+        except Exception as e:
+            result.add_error(f"Failed to validate items: {str(e)}", ValidationLevel.HIGH)
+            return result
+
+        return self._check_question_items(doc)
+
+    def _check_question_items(self, doc) -> ValidationResult:
+        """Validate the question items of a parsed document."""
+        result = ValidationResult(is_valid=True)
+
+        try:
             ns = {'q': self.QTI_NAMESPACE}
 
             items = doc.findall('.//q:item', ns)
@@ -215,8 +324,12 @@ class QTIValidator(IMSCCValidator):
         if itemmetadata is None:
             result.add_warning(f"{prefix}: Missing itemmetadata")
         else:
+            qtimetadata = itemmetadata.find('q:qtimetadata', ns)
+            fields = (self._collect_qtimetadata_fields(qtimetadata, ns)
+                      if qtimetadata is not None else {})
+
             # Get cc_profile
-            profile = self._get_item_profile(itemmetadata, ns)
+            profile = fields.get('cc_profile')
             if profile:
                 if profile not in self.VALID_QUESTION_PROFILES:
                     result.add_warning(f"{prefix}: Unrecognized cc_profile '{profile}'")
@@ -225,7 +338,7 @@ class QTIValidator(IMSCCValidator):
                     self._validate_question_type_structure(item, ns, profile, prefix, result)
 
             # Validate cc_weighting (points) - should exist and be numeric
-            weighting = self._get_item_weighting(itemmetadata, ns)
+            weighting = fields.get('cc_weighting')
             if weighting is not None:
                 try:
                     float(weighting)
@@ -263,29 +376,25 @@ class QTIValidator(IMSCCValidator):
 
         return result
 
-    def _get_item_profile(self, itemmetadata, ns: dict) -> Optional[str]:
-        """Extract cc_profile from itemmetadata."""
-        qtimetadata = itemmetadata.find('q:qtimetadata', ns)
-        if qtimetadata is not None:
-            for field in qtimetadata.findall('q:qtimetadatafield', ns):
-                label = field.find('q:fieldlabel', ns)
-                entry = field.find('q:fieldentry', ns)
-                if label is not None and entry is not None:
-                    if label.text == 'cc_profile':
-                        return entry.text
-        return None
-
-    def _get_item_weighting(self, itemmetadata, ns: dict) -> Optional[str]:
-        """Extract cc_weighting (points) from itemmetadata."""
-        qtimetadata = itemmetadata.find('q:qtimetadata', ns)
-        if qtimetadata is not None:
-            for field in qtimetadata.findall('q:qtimetadatafield', ns):
-                label = field.find('q:fieldlabel', ns)
-                entry = field.find('q:fieldentry', ns)
-                if label is not None and entry is not None:
-                    if label.text == 'cc_weighting':
-                        return entry.text
-        return None
+    def _iter_qtimetadata_fields(self, qtimetadata,
+                                 ns: dict) -> Iterator[Tuple[Optional[str], Optional[str]]]:
+        """Yield qtimetadatafield label/entry text pairs in document order."""
+        for field in qtimetadata.findall('q:qtimetadatafield', ns):
+            label = field.find('q:fieldlabel', ns)
+            entry = field.find('q:fieldentry', ns)
+            if label is not None and entry is not None:
+                yield label.text, entry.text
+
+    def _collect_qtimetadata_fields(self, qtimetadata, ns: dict) -> Dict[str, Optional[str]]:
+        """
+        Collect qtimetadatafield label/entry pairs in a single pass.
+
+        When a label repeats, the first entry wins.
+        """
+        fields: Dict[str, Optional[str]] = {}
+        for label, entry in self._iter_qtimetadata_fields(qtimetadata, ns):
+            fields.setdefault(label, entry)
+        return fields
 
     def _validate_question_type_structure(self, item, ns: dict, profile: str,
                                           prefix: str, result: ValidationResult):
@@ -294,7 +403,7 @@ class QTIValidator(IMSCCValidator):
         if presentation is None:
             return
 
-        if profile in ['cc.multiple_choice.v0p1', 'cc.true_false.v0p1', 'cc.multiple_response.v0p1']:
+        if profile in self._REQUIRES_RESPONSE_LID:
             # Should have response_lid
             response_lid = presentation.find('q:response_lid', ns)
             if response_lid is None:
@@ -305,15 +414,17 @@ class QTIValidator(IMSCCValidator):
             else:
                 # Check rcardinality
                 cardinality = response_lid.get('rcardinality', 'Single')
-                if profile == 'cc.multiple_response.v0p1' and cardinality != 'Multiple':
-                    result.add_error(
-                        f"{prefix}: multiple_response requires rcardinality='Multiple'",
-                        ValidationLevel.HIGH
-                    )
-                elif profile in ['cc.multiple_choice.v0p1', 'cc.true_false.v0p1'] and cardinality != 'Single':
-                    result.add_warning(
-                        f"{prefix}: {profile} typically uses rcardinality='Single'"
-                    )
+                expected = self._EXPECTED_CARDINALITY[profile]
+                if cardinality != expected:
+                    if expected == 'Multiple':
+                        result.add_error(
+                            f"{prefix}: multiple_response requires rcardinality='Multiple'",
+                            ValidationLevel.HIGH
+                        )
+                    else:
+                        result.add_warning(
+                            f"{prefix}: {profile} typically uses rcardinality='{expected}'"
+                        )
 
                 # Check for render_choice
                 render_choice = response_lid.find('q:render_choice', ns)
@@ -335,7 +446,7 @@ class QTIValidator(IMSCCValidator):
                             f"{prefix}: true_false should have exactly 2 choices"
                         )
 
-        elif profile in ['cc.fib.v0p1', 'cc.essay.v0p1']:
+        elif profile in self._REQUIRES_RESPONSE_STR:
             # Should have response_str
             response_str = presentation.find('q:response_str', ns)
             if response_str is None:
@@ -344,7 +455,7 @@ class QTIValidator(IMSCCValidator):
                     ValidationLevel.HIGH
                 )
 
-    def _validate_identifiers(self, xml_content: str) -> ValidationResult:
+    def _validate_identifiers(self, xml_content: Union[bytes, str]) -> ValidationResult:
         """Validate that all identifiers are unique."""
         result = ValidationResult(is_valid=True)
 
@@ -353,28 +464,38 @@ class QTIValidator(IMSCCValidator):
             return result
 
         try:
-            doc = etree.fromstring(xml_content.encode('utf-8'))
-            ns = {'q': self.QTI_NAMESPACE}
+            doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
+        except Exception as e:
+            result.add_error(f"Failed to validate identifiers: {str(e)}", ValidationLevel.MEDIUM)
+            return result
+
+        return self._check_identifiers(doc)
 
-            seen_ids: Set[str] = set()
+    def _check_identifiers(self, doc) -> ValidationResult:
+        """Validate that all identifiers in a parsed document are unique."""
+        result = ValidationResult(is_valid=True)
+
+        try:
+            # Maps ident -> position of first occurrence; setdefault does
+            # the membership test and insert in a single hash probe
+            seen_ids: Dict[str, int] = {}
+            first_seen = seen_ids.setdefault
 
             # Collect all ident attributes
-            for elem in doc.iter():
+            for position, elem in enumerate(_XP_IDENT_ELEMENTS(doc)):
                 ident = elem.get('ident')
-                if ident is not None:
-                    # Check for empty or whitespace-only idents
-                    if not ident.strip():
-                        result.add_error(
-                            f"Element '{elem.tag}' has empty or whitespace-only ident attribute",
-                            ValidationLevel.HIGH
-                        )
-                        continue
-                    if ident in seen_ids:
-                        result.add_error(
-                            f"Duplicate identifier found: '{ident}'",
-                            ValidationLevel.HIGH
-                        )
-                    seen_ids.add(ident)
+                # Check for empty or whitespace-only idents
+                if not ident.strip():
+                    result.add_error(
+                        f"Element '{elem.tag}' has empty or whitespace-only ident attribute",
+                        ValidationLevel.HIGH
+                    )
+                    continue
+                if first_seen(ident, position) != position:
+                    result.add_error(
+                        f"Duplicate identifier found: '{ident}'",
+                        ValidationLevel.HIGH
+                    )
 
         except Exception as e:
             result.add_error(f"Failed to validate identifiers: {str(e)}", ValidationLevel.MEDIUM)
@@ -385,16 +506,64 @@ class QTIValidator(IMSCCValidator):
         """Return the correct manifest resource type for QTI assessments."""
         return "imsqti_xmlv1p2/imscc_xmlv1p3/assessment"
 
+    @staticmethod
+    def clear_cache():
+        """Discard cached validate_qti() results."""
+        with _RESULT_CACHE_LOCK:
+            _RESULT_CACHE.clear()
+
 
-def validate_qti(xml_content: str) -> ValidationResult:
+def validate_qti(xml_content: Union[bytes, str]) -> ValidationResult:
     """
     Convenience function to validate QTI assessment XML.
 
+    Results are cached by content digest, so repeated validation of
+    identical XML returns a copy of the earlier result.
+
     Args:
         xml_content: QTI XML string
 
     Returns:
         ValidationResult with all validation findings
     """
+    digest = hashlib.blake2b(_as_bytes(xml_content), digest_size=16).digest()
+
+    with _RESULT_CACHE_LOCK:
+        cached = _RESULT_CACHE.get(digest)
+        if cached is not None:
+            _RESULT_CACHE.move_to_end(digest)
+            return copy.deepcopy(cached)
+
     validator = QTIValidator()
-    return validator.validate(xml_content)
+    result = validator.validate(xml_content)
+
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[digest] = copy.deepcopy(result)
+        if len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+
+    return result
+
+
+def validate_many(xml_contents: Iterable[Union[bytes, str]],
+                  max_workers: Optional[int] = None) -> List[ValidationResult]:
+    """
+    Validate many QTI assessment documents in parallel worker processes.
+
+    Parsing and schema validation are CPU-bound, so whole-package runs
+    scale with core count. Each worker compiles the XSD schemas once via
+    the shared schema cache and reuses them for every document it handles.
+
+    Args:
+        xml_contents: QTI XML strings or UTF-8 bytes
+        max_workers: Worker process count (defaults to the CPU count)
+
+    Returns:
+        ValidationResult for each document, in input order
+    """
+    documents = list(xml_contents)
+    if len(documents) < 2 or max_workers == 1:
+        return [validate_qti(doc) for doc in documents]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(validate_qti, documents, chunksize=4))
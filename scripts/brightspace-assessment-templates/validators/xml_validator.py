@@ -5,8 +5,9 @@ Provides XSD schema validation and namespace verification for IMSCC XML files.
 """
 
 import os
+import threading
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -18,6 +19,34 @@ except ImportError:
     import xml.etree.ElementTree as etree
 
 
+if LXML_AVAILABLE:
+    # Shared parser for all validators: no entity expansion (blocks XXE),
+    # no network access, and no xml:id table since idents are tracked by
+    # the validators themselves.
+    _PARSER = etree.XMLParser(
+        resolve_entities=False,
+        no_network=True,
+        collect_ids=False,
+        huge_tree=False,
+    )
+else:
+    _PARSER = None
+
+
+# Compiled XSD schemas keyed by schema file path, shared by all validator
+# instances so each schema is read and compiled at most once per process.
+# A None entry records a schema that failed to load.
+_SCHEMA_CACHE: Dict[str, Optional['etree.XMLSchema']] = {}
+_SCHEMA_LOCK = threading.Lock()
+
+
+def _as_bytes(xml_content: Union[bytes, str]) -> bytes:
+    """Return XML content as bytes, encoding str input as UTF-8 and passing bytes through."""
+    if isinstance(xml_content, (bytes, bytearray)):
+        return xml_content
+    return xml_content.encode('utf-8')
+
+
 class ValidationLevel(Enum):
     """Severity levels for validation issues."""
     CRITICAL = "CRITICAL"  # Will cause import failure
@@ -41,6 +70,10 @@ class ValidationResult:
         if level.value in ['CRITICAL', 'HIGH']:
             self.level = level
 
+    def has_critical_errors(self) -> bool:
+        """Return True if any error was recorded at CRITICAL level."""
+        return any(error.startswith('[CRITICAL] ') for error in self.errors)
+
     def add_warning(self, message: str):
         """Add a warning message."""
         self.warnings.append(message)
@@ -83,30 +116,59 @@ class IMSCCValidator:
         'qti': 'ccv1p3_qtiasiv1p2p1.xsd',
     }
 
-    def __init__(self):
-        """Initialize validator and load schemas if lxml is available."""
-        self.schemas = {}
-        if LXML_AVAILABLE:
-            self._load_schemas()
+    @property
+    def schemas(self) -> Dict[str, 'etree.XMLSchema']:
+        """Schemas currently available to this validator, keyed by schema type."""
+        loaded = {}
+        for schema_type in self.SCHEMA_FILES:
+            schema = _SCHEMA_CACHE.get(str(self.SCHEMA_DIR / self.SCHEMA_FILES[schema_type]))
+            if schema is not None:
+                loaded[schema_type] = schema
+        return loaded
+
+    @classmethod
+    def _get_schema(cls, schema_type: str) -> Optional['etree.XMLSchema']:
+        """
+        Return the compiled XSD schema for a content type, loading it on first use.
+
+        Args:
+            schema_type: Type of schema ('assignment', 'discussion', 'qti')
+
+        Returns:
+            Compiled XMLSchema, or None if unavailable
+        """
+        if not LXML_AVAILABLE or schema_type not in cls.SCHEMA_FILES:
+            return None
+
+        schema_path = cls.SCHEMA_DIR / cls.SCHEMA_FILES[schema_type]
+        key = str(schema_path)
+        if key in _SCHEMA_CACHE:
+            return _SCHEMA_CACHE[key]
+
+        with _SCHEMA_LOCK:
+            if key not in _SCHEMA_CACHE:
+                schema = None
+                if schema_path.exists():
+                    try:
+                        with open(schema_path, 'rb') as f:
+                            schema_doc = etree.parse(f)
+                            schema = etree.XMLSchema(schema_doc)
+                    except Exception as e:
+                        print(f"Warning: Could not load schema {schema_path.name}: {e}")
+                _SCHEMA_CACHE[key] = schema
+            return _SCHEMA_CACHE[key]
 
     def _load_schemas(self):
-        """Load XSD schemas from schema directory."""
-        for schema_type, filename in self.SCHEMA_FILES.items():
-            schema_path = self.SCHEMA_DIR / filename
-            if schema_path.exists():
-                try:
-                    with open(schema_path, 'rb') as f:
-                        schema_doc = etree.parse(f)
-                        self.schemas[schema_type] = etree.XMLSchema(schema_doc)
-                except Exception as e:
-                    print(f"Warning: Could not load schema {filename}: {e}")
-
-    def validate_xml_string(self, xml_content: str, schema_type: str) -> ValidationResult:
+        """Preload all XSD schemas from schema directory into the shared cache."""
+        for schema_type in self.SCHEMA_FILES:
+            self._get_schema(schema_type)
+
+    def validate_xml_string(self, xml_content: Union[bytes, str], schema_type: str) -> ValidationResult:
         """
         Validate XML content against specified schema.
 
         Args:
-            xml_content: XML string to validate
+            xml_content: XML string or UTF-8 bytes to validate
             schema_type: Type of schema ('assignment', 'discussion', 'qti')
 
         Returns:
@@ -117,7 +179,7 @@ class IMSCCValidator:
         # First check well-formedness
         try:
             if LXML_AVAILABLE:
-                doc = etree.fromstring(xml_content.encode('utf-8'))
+                doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
             else:
                 doc = etree.fromstring(xml_content)
         except Exception as e:
@@ -125,8 +187,25 @@ class IMSCCValidator:
             return result
 
         # Schema validation (only with lxml)
-        if LXML_AVAILABLE and schema_type in self.schemas:
-            schema = self.schemas[schema_type]
+        result.merge(self.validate_schema(doc, schema_type))
+
+        return result
+
+    def validate_schema(self, doc, schema_type: str) -> ValidationResult:
+        """
+        Validate an already-parsed document against the specified schema.
+
+        Args:
+            doc: Parsed root element
+            schema_type: Type of schema ('assignment', 'discussion', 'qti')
+
+        Returns:
+            ValidationResult with schema violations
+        """
+        result = ValidationResult(is_valid=True)
+
+        schema = self._get_schema(schema_type)
+        if schema is not None:
             if not schema.validate(doc):
                 for error in schema.error_log:
                     result.add_error(f"Schema violation: {error.message}", ValidationLevel.HIGH)
@@ -135,12 +214,12 @@ class IMSCCValidator:
 
         return result
 
-    def validate_namespace(self, xml_content: str, expected_type: str) -> ValidationResult:
+    def validate_namespace(self, xml_content: Union[bytes, str], expected_type: str) -> ValidationResult:
         """
         Validate that XML uses the correct namespace for its type.
 
         Args:
-            xml_content: XML string to validate
+            xml_content: XML string or UTF-8 bytes to validate
             expected_type: Expected content type ('assignment', 'discussion', 'qti')
 
         Returns:
@@ -155,7 +234,7 @@ class IMSCCValidator:
 
         try:
             if LXML_AVAILABLE:
-                doc = etree.fromstring(xml_content.encode('utf-8'))
+                doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
                 actual_ns = doc.nsmap.get(None, '')
             else:
                 doc = etree.fromstring(xml_content)
@@ -176,12 +255,12 @@ class IMSCCValidator:
 
         return result
 
-    def validate_root_element(self, xml_content: str, expected_root: str) -> ValidationResult:
+    def validate_root_element(self, xml_content: Union[bytes, str], expected_root: str) -> ValidationResult:
         """
         Validate that XML has the expected root element.
 
         Args:
-            xml_content: XML string to validate
+            xml_content: XML string or UTF-8 bytes to validate
             expected_root: Expected root element name (without namespace)
 
         Returns:
@@ -191,7 +270,7 @@ class IMSCCValidator:
 
         try:
             if LXML_AVAILABLE:
-                doc = etree.fromstring(xml_content.encode('utf-8'))
+                doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
                 # lxml includes namespace in tag
                 local_name = etree.QName(doc.tag).localname
             else:
@@ -209,13 +288,13 @@ class IMSCCValidator:
 
         return result
 
-    def validate_required_elements(self, xml_content: str, required: List[str],
+    def validate_required_elements(self, xml_content: Union[bytes, str], required: List[str],
                                    namespace: str = None) -> ValidationResult:
         """
         Validate that XML contains all required child elements.
 
         Args:
-            xml_content: XML string to validate
+            xml_content: XML string or UTF-8 bytes to validate
             required: List of required element names
             namespace: Optional namespace URI
 
@@ -226,7 +305,7 @@ class IMSCCValidator:
 
         try:
             if LXML_AVAILABLE:
-                doc = etree.fromstring(xml_content.encode('utf-8'))
+                doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
             else:
                 doc = etree.fromstring(xml_content)
 
@@ -249,47 +328,67 @@ class IMSCCValidator:
 
         return result
 
-    def check_xml_escaping(self, xml_content: str) -> ValidationResult:
+    # Text that may legitimately follow '&' or '<' in serialized XML
+    _ENTITY_PREFIXES = ('amp', 'lt', 'gt', 'quot', 'apos', '#')
+    _TAG_START_CHARS = frozenset('/!?abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+    # Attributes that must not be empty or whitespace-only
+    _IDENTIFIER_ATTRIBUTES = ('identifier', 'identifierref', 'ident', 'href')
+
+    def check_xml_escaping(self, xml_content: Union[bytes, str], doc=None) -> ValidationResult:
         """
         Check for common XML escaping issues in content and attributes.
 
         Args:
-            xml_content: XML string to check
+            xml_content: XML string or UTF-8 bytes to check
+            doc: Optional already-parsed root element, to avoid re-parsing
 
         Returns:
             ValidationResult with escaping issues found
         """
         result = ValidationResult(is_valid=True)
 
-        import re
+        text = xml_content if isinstance(xml_content, str) else bytes(xml_content).decode('utf-8', 'replace')
 
         # Common unescaped characters that cause issues in text content
-        problematic_patterns = [
-            ('&(?!(amp|lt|gt|quot|apos|#))', 'Unescaped ampersand (&) found'),
-            ('<(?!/|[a-zA-Z!?])', 'Potentially unescaped less-than (<) found'),
-        ]
+        if self._has_unescaped_ampersand(text):
+            result.add_warning('Unescaped ampersand (&) found')
+        if self._has_unescaped_less_than(text):
+            result.add_warning('Potentially unescaped less-than (<) found')
 
-        for pattern, message in problematic_patterns:
-            if re.search(pattern, xml_content):
-                result.add_warning(message)
-
-        # Validate attribute values for unescaped quotes
-        # Find attribute values and check for issues
+        # Check for empty or whitespace-only critical attributes.
+        # If lxml parsed successfully, special chars were properly escaped.
         if LXML_AVAILABLE:
             try:
-                doc = etree.fromstring(xml_content.encode('utf-8'))
+                if doc is None:
+                    doc = etree.fromstring(_as_bytes(xml_content), _PARSER)
                 for elem in doc.iter():
-                    for attr_name, attr_value in elem.attrib.items():
-                        if attr_value:
-                            # Note: If lxml parsed successfully, special chars were properly escaped.
-                            # Check for empty or whitespace-only critical attributes
-                            if attr_name in ('identifier', 'identifierref', 'ident', 'href'):
-                                if not attr_value.strip():
-                                    result.add_error(
-                                        f"Element '{elem.tag}' has empty or whitespace-only '{attr_name}' attribute",
-                                        ValidationLevel.HIGH
-                                    )
+                    for attr_name in self._IDENTIFIER_ATTRIBUTES:
+                        attr_value = elem.get(attr_name)
+                        if attr_value and not attr_value.strip():
+                            result.add_error(
+                                f"Element '{elem.tag}' has empty or whitespace-only '{attr_name}' attribute",
+                                ValidationLevel.HIGH
+                            )
             except Exception:
                 pass  # Parsing errors handled elsewhere
 
         return result
+
+    def _has_unescaped_ampersand(self, xml_content: str) -> bool:
+        """Return True if any '&' does not start a known entity or character reference."""
+        pos = xml_content.find('&')
+        while pos != -1:
+            if not xml_content.startswith(self._ENTITY_PREFIXES, pos + 1):
+                return True
+            pos = xml_content.find('&', pos + 1)
+        return False
+
+    def _has_unescaped_less_than(self, xml_content: str) -> bool:
+        """Return True if any '<' is not followed by a tag, comment, or declaration start."""
+        pos = xml_content.find('<')
+        while pos != -1:
+            if xml_content[pos + 1:pos + 2] not in self._TAG_START_CHARS:
+                return True
+            pos = xml_content.find('<', pos + 1)
+        return False
@@ -14,21 +14,666 @@ Core Requirements:
 - Implement native Brightspace assessment integration
 """
 
+import contextlib
+import io
+import itertools
 import os
 import re
 import json
+import logging
+import time
 import zipfile
+import secrets
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 import xml.etree.ElementTree as ET
+from xml.parsers import expat
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+    import xml.etree.ElementTree as etree
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+XSI_NAMESPACE = "http://www.w3.org/2001/XMLSchema-instance"
+LOM_NAMESPACE = "http://ltsc.ieee.org/xsd/imsccv1p3/LOM/resource"
+
+# Write buffer for package archives; many small entries otherwise turn into
+# many small writes against the output file
+_ZIP_BUFFER_SIZE = 1 << 20
+# Entries below this size are stored: deflate saves a few hundred bytes at
+# most on them. Larger text entries use the fastest deflate level.
+_ZIP_STORE_THRESHOLD = 1024
+_ZIP_COMPRESS_LEVEL = 1
+
+# Shared page assets, relative to the HTML objects in a package
+_CSS_ASSET = "css/bootstrap.min.css"
+_JS_ASSET = "js/bootstrap.bundle.min.js"
+_ASSET_FILES = (_CSS_ASSET, _JS_ASSET)
+_ASSETS_RESOURCE_ID = "shared_assets_R"
+
+# Concurrent reads when loading module markdown files
+_READ_WORKERS = 8
+
+# Markdown parsing patterns, compiled once at import time
+_TITLE_RE = re.compile(r"^# (.+)$", re.MULTILINE)
+_DESCRIPTION_RE = re.compile(r"^# .+?\n\n(.+?)(?=## |$)", re.DOTALL | re.MULTILINE)
+_OBJECTIVES_RE = re.compile(r"## Learning Objectives?|Objectives?:?\s*\n((?:[-*]\s*.+\n?)+)", re.DOTALL)
+_SECTION_RE = re.compile(r"## (.+?)\n(.*?)(?=##|\Z)", re.DOTALL)
+_MODULE_NUMBER_RE = re.compile(r"module_(\d+)")
+_MODULE_OBJECT_RE = re.compile(r"module_(\d+)_")  # module numbers inside object ids
+_POINTS_RE = re.compile(r"points?:\s*(\d+)", re.IGNORECASE)
+_BULLET_RE = re.compile(r'^[-*]\s*')
+_KEYWORD_RE = re.compile(r'\b\w{4,}\b')
+# Assessment kinds, as used in generated assessment ids and resource_types
+_ASSESSMENT_KINDS = ('quiz', 'assignment', 'discussion')
+_ASSESSMENT_TITLE_RE = re.compile(r'<title>([^<]+)</title>')
+_STYLE_BLOCK_RE = re.compile(r'<style\b[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_KEY_CONCEPT_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+_WEEK_MODULE_RE = re.compile(r'(?:week|module)[_-]?(\d+)', re.IGNORECASE)
+_CONTENT_NUM_RE = re.compile(r'content[_-]?(\d+)')
+# Content ordering within a module: the first keyword found in an object id
+# gives its sort priority; ids matching none sort last
+_CONTENT_SORT_KEYWORDS = (
+    ('overview', 0),
+    ('objectives', 1),
+    ('content', 2),
+    ('summary', 3),
+    ('selfcheck', 4),
+    ('self_check', 4),
+    ('discussion', 5),
+    ('assignment', 6),
+    ('quiz', 7),
+)
+_CONTENT_SORT_LAST = 8
+_CONTENT_PRIORITY = 2
+# Organization titles for the fixed page kinds, by sort priority
+_CONTENT_ITEM_TITLES = {
+    0: "Module Overview",
+    1: "Learning Objectives",
+    3: "Module Summary",
+    4: "Self-Check Activities",
+}
+_FILENAME_UNSAFE_RE = re.compile(r'[^a-zA-Z0-9_-]')
+_MIN_PAGE_WORDS = 50  # pre-flight minimum words of text per HTML object
+# Unresolved template variables, reported in this order. Each pattern is
+# paired with a literal every match contains; a plain substring test on it
+# skips the regex scan for the usual, clean document. Shell-style and double
+# brace variables always contain a standard brace variable, so they are only
+# looked for once that first pattern has matched
+_BRACE_VARIABLE_RE = re.compile(r'\{[^}]+\}')  # Standard curly brace variables
+_NESTED_BRACE_VARIABLE_RES = (
+    re.compile(r'\$\{[^}]+\}'),  # Shell-style variables
+    re.compile(r'{{[^}]+}}'),    # Double curly braces
+)
+_TEMPLATE_VARIABLE_RES = (
+    ('[placeholder]', re.compile(r'\[placeholder\]')),  # Bracket placeholders
+    ('MODULE_', re.compile(r'MODULE_\d+')),          # Module number placeholders
+    ('WEEK_', re.compile(r'WEEK_\d+')),              # Week number placeholders
+)
+# Hardcoded references stripped by remove_hardcoded_references, in order.
+# Each pattern is paired with a lowercase word every match contains; no
+# letter in these words has a case-insensitive match that lowercases to
+# anything else, so a plain substring test on the lowercased text decides
+# whether the case-insensitive scan can match at all
+_HARDCODED_REF_RES = tuple((literal, re.compile(pattern, re.IGNORECASE)) for literal, pattern in (
+    ('textbook', r'See textbook chapter \d+'),
+    ('textbook', r'Reference: [^.]+textbook[^.]*\.'),
+    ('textbook', r'As discussed in the course textbook'),
+    ('chapter', r'Chapter \d+ of the assigned reading'),
+))
+
+# Content cleaning scanner: every markdown clean-up step is one alternative
+# of a single pattern, so section text is rewritten in one pass. Literal
+# spaces in the reference patterns accept runs of blanks because spacing is
+# no longer collapsed before they are matched.
+_EMPHASIS_PATTERNS = (
+    r'(?P<bold_italic>\*\*\*(?P<bold_italic_text>[^*\n]+?)\*\*\*)'
+    r'|(?P<bold>\*\*(?P<bold_text>.*?)\*\*)'
+    r'|(?P<italic>\*(?P<italic_text>(?:\*\*.*?\*\*|[^*\n])*)\*)'  # may wrap bold text
+)
+_REFERENCE_PATTERNS = (  # hardcoded textbook references
+    r'(?P<reference>'
+    r'See[ \t]+chapter[ \t]+\d+.*?\.'
+    r'|Reference:.*?textbook.*?\.'
+    r'|As[ \t]+discussed[ \t]+in[ \t]+the.*?textbook.*?\.'
+    r'|Chapter[ \t]+\d+[ \t]+of[ \t]+the[ \t]+assigned[ \t]+reading.*?\.'
+    r'|\[textbook[ \t]+reference\]'
+    r'|Please[ \t]+refer[ \t]+to.*?textbook.*?\.'
+    r')'
+)
+_CLEAN_RE = re.compile(
+    _EMPHASIS_PATTERNS
+    + r'|(?P<heading>^#{3,}\s*)'  # h3+ headers
+    + r'|(?P<blank>\n\s*\n\s*\n+)'  # runs of blank lines
+    + r'|(?P<space>[ \t]+)'
+    + r'|' + _REFERENCE_PATTERNS,
+    re.MULTILINE | re.IGNORECASE
+)
+# Emphasis text never spans lines, so only the inline steps apply inside it
+_INLINE_CLEAN_RE = re.compile(
+    _EMPHASIS_PATTERNS + r'|(?P<space>[ \t]+)|' + _REFERENCE_PATTERNS,
+    re.IGNORECASE
+)
+
+
+# Text pipeline for section content. These are plain functions of their
+# input so they carry no packager state and can be swapped for a compiled
+# implementation without touching the class.
+
+_SHORT_PARAGRAPH_PADDING = "This concept is fundamental to understanding the broader principles discussed in this module."
+
+
+def _scan_xml_structure(xml_bytes: bytes) -> Tuple[str, set, set]:
+    """
+    Scan an XML document in one expat pass without building a tree
+    
+    Element names use the same {namespace}local form as ElementTree tags.
+    
+    Args:
+        xml_bytes: Encoded XML document
+        
+    Returns:
+        Tuple of the root tag, the set of tags found below the root, and the
+        text of each fieldlabel child of a qtimetadatafield
+        
+    Raises:
+        expat.ExpatError: If the document is not well-formed
+    """
+    parser = expat.ParserCreate(namespace_separator='}')
+    open_tags: List[str] = []
+    root_tag = ""
+    descendant_tags = set()
+    metadata_labels = set()
+    label_text: List[str] = []
+    label_depth = 0  # depth of the open metadata fieldlabel, 0 when none
+    
+    def start_element(name, attributes):
+        nonlocal root_tag, label_depth
+        tag = f"{{{name}" if '}' in name else name
+        if not open_tags:
+            root_tag = tag
+        else:
+            descendant_tags.add(tag)
+            if not label_depth and tag == 'fieldlabel' and open_tags[-1] == 'qtimetadatafield':
+                label_depth = len(open_tags) + 1
+                label_text.clear()
+                parser.CharacterDataHandler = label_text.append
+        open_tags.append(tag)
+    
+    def end_element(name):
+        nonlocal label_depth
+        if len(open_tags) == label_depth:
+            metadata_labels.add("".join(label_text))
+            label_depth = 0
+            parser.CharacterDataHandler = None
+        open_tags.pop()
+    
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    # Text is only collected while a metadata fieldlabel is open, so no
+    # Python callback runs for the rest of the character data; buffering
+    # hands each text run over in one piece
+    parser.buffer_text = True
+    # The whole document is parsed so malformed tails are still rejected
+    parser.Parse(xml_bytes, True)
+    
+    return root_tag, descendant_tags, metadata_labels
+
+
+def _zip_entry_info(name: str, date_time: Tuple[int, ...]) -> zipfile.ZipInfo:
+    """Entry header with the permissions writestr gives a plain name"""
+    info = zipfile.ZipInfo(name, date_time)
+    info.external_attr = 0o600 << 16
+    return info
+
+
+def _write_zip_bytes(zip_file: zipfile.ZipFile, name: str, data: bytes, date_time: Tuple[int, ...]) -> None:
+    """Write an encoded entry, storing it uncompressed below the size threshold"""
+    info = _zip_entry_info(name, date_time)
+    if len(data) < _ZIP_STORE_THRESHOLD:
+        info.compress_type = zipfile.ZIP_STORED
+        zip_file.writestr(info, data)
+    else:
+        info.compress_type = zipfile.ZIP_DEFLATED
+        zip_file.writestr(info, data, compresslevel=_ZIP_COMPRESS_LEVEL)
+
+
+def _write_zip_text(zip_file: zipfile.ZipFile, name: str, text: str, date_time: Tuple[int, ...]) -> None:
+    """Write a UTF-8 text entry with a shared timestamp, storing small entries uncompressed"""
+    _write_zip_bytes(zip_file, name, text.encode('utf-8'), date_time)
+
+
+def _load_json_bytes(data: bytes):
+    """Decode a JSON document from raw bytes, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _find_template_variables(content: str) -> List[str]:
+    """Unresolved template variables in content, grouped by pattern in _TEMPLATE_VARIABLE_RES order"""
+    # Enhanced patterns for comprehensive detection
+    all_unresolved = _BRACE_VARIABLE_RE.findall(content) if '{' in content else []
+    if all_unresolved:
+        for pattern in _NESTED_BRACE_VARIABLE_RES:
+            all_unresolved.extend(pattern.findall(content))
+    for literal, pattern in _TEMPLATE_VARIABLE_RES:
+        if literal in content:
+            all_unresolved.extend(pattern.findall(content))
+    return all_unresolved
+
+
+def _directory_names(directory: Path) -> frozenset:
+    """Names of the entries in a directory, empty if it cannot be listed"""
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(entry.name for entry in entries)
+    except OSError:
+        return frozenset()
+
+
+def _index_module_assessments(modules: List[Dict]) -> Dict[str, Dict]:
+    """Map each assessment id listed under modules[].assessments to the first module listing it"""
+    module_index: Dict[str, Dict] = {}
+    for module in modules:
+        for assessment_id in module.get('assessments', []):
+            if isinstance(assessment_id, str):
+                module_index.setdefault(assessment_id, module)
+    return module_index
+
+
+def _objective_lines(objectives_text: str) -> List[str]:
+    """Return the objective texts from an objectives list captured by _OBJECTIVES_RE"""
+    stripped_lines = (line.strip() for line in objectives_text.split('\n'))
+    return [
+        line.lstrip('- *')
+        for line in stripped_lines
+        if line and not line.startswith('#')
+    ]
+
+
+def _clean_token(match: re.Match) -> str:
+    """Replacement for a single _CLEAN_RE or _INLINE_CLEAN_RE match"""
+    kind = match.lastgroup
+    if kind == 'space':
+        return ' '
+    if kind == 'blank':
+        return '\n\n'
+    if kind == 'bold_italic':
+        return f"<strong><em>{_INLINE_CLEAN_RE.sub(_clean_token, match.group('bold_italic_text'))}</em></strong>"
+    if kind == 'bold':
+        # Emphasis text is cleaned too, as it was when the passes ran in sequence
+        return f"<strong>{_INLINE_CLEAN_RE.sub(_clean_token, match.group('bold_text'))}</strong>"
+    if kind == 'italic':
+        return f"<em>{_INLINE_CLEAN_RE.sub(_clean_token, match.group('italic_text'))}</em>"
+    # Headers and hardcoded references are removed
+    return ''
+
+
+def clean_content(content: str) -> str:
+    """Enhanced content cleaning and formatting for HTML generation (Debug Pattern 5 Fix)"""
+    if not content:
+        return ""
+    
+    # Steps 1-3: Normalize whitespace, convert bold/italic to HTML, and drop
+    # h3+ headers and hardcoded references (Debug Pattern 5 Fix) in one scan
+    content = _CLEAN_RE.sub(_clean_token, content)
+    
+    # Step 4: Enhance content if too short
+    words = content.split()
+    if len(words) < 30:
+        # Add contextual enhancement
+        content += " This topic provides essential knowledge for understanding the broader concepts discussed throughout the course."
+    
+    # Step 5: Structure into proper paragraphs
+    paragraphs = content.split('\n\n')
+    enhanced_paragraphs = []
+    
+    for para in paragraphs:
+        para = para.strip()
+        if para:
+            # Ensure paragraph is substantial
+            para_words = para.split()
+            if len(para_words) < 15:
+                para += " This concept builds upon previous learning and prepares students for more advanced topics."
+            enhanced_paragraphs.append(para)
+    
+    return '\n\n'.join(enhanced_paragraphs)
+
+
+def _iter_paragraph_spans(content: str) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) offsets of the blank-line separated paragraphs in content"""
+    start = 0
+    while True:
+        end = content.find('\n\n', start)
+        if end == -1:
+            yield start, len(content)
+            return
+        yield start, end
+        start = end + 2
+
+
+def format_content_paragraphs(content: str) -> str:
+    """Format content into properly structured paragraphs (50-300 words)"""
+    formatted_paragraphs = []
+    
+    for start, end in _iter_paragraph_spans(content):
+        paragraph = content[start:end]
+        # str.split() is the cheapest exact word count; it also tells us
+        # whether the paragraph is blank
+        words = paragraph.split()
+        if not words:
+            continue
+        
+        # Ensure paragraph length is appropriate
+        if len(words) < 50:
+            # Pad short paragraphs with additional context
+            formatted_paragraphs.append(f'<p class="content-paragraph">{paragraph.lstrip()} {_SHORT_PARAGRAPH_PADDING}</p>')
+        elif len(words) > 300:
+            # Split long paragraphs
+            mid_point = len(words) // 2
+            first_half = ' '.join(words[:mid_point])
+            second_half = ' '.join(words[mid_point:])
+            formatted_paragraphs.append(f'<p class="content-paragraph">{first_half}</p>')
+            formatted_paragraphs.append(f'<p class="content-paragraph">{second_half}</p>')
+        else:
+            formatted_paragraphs.append(f'<p class="content-paragraph">{paragraph.strip()}</p>')
+    
+    return '\n'.join(formatted_paragraphs)
+
+
+# HTML page templates, filled with str.format_map (literal CSS braces are
+# doubled). Pages link the stylesheet and script bundled into every package
+# at _ASSET_FILES instead of repeating CDN links, so packages work offline.
+_HTML_TEMPLATES = {
+    'overview': """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <link rel="stylesheet" href="css/bootstrap.min.css">
+    <style>
+        .content-paragraph {{ line-height: 1.6; margin-bottom: 1rem; }}
+        .module-header {{ background: #f8f9fa; padding: 2rem; border-radius: 0.5rem; margin-bottom: 2rem; }}
+    </style>
+</head>
+<body>
+    <div class="container-fluid">
+        <div class="module-header">
+            <h1>{title}</h1>
+            <p class="lead content-paragraph">Welcome to {title}. This module will introduce you to key concepts and provide hands-on learning experiences.</p>
+        </div>
+        
+        <div class="row">
+            <div class="col-12">
+                <h2>Module Overview</h2>
+                <p class="content-paragraph">In this module, you will explore important topics and develop practical skills through interactive activities and assessments.</p>
+                
+                <h3>What You'll Learn</h3>
+                <p class="content-paragraph">By the end of this module, you will have gained valuable knowledge and skills that build upon previous learning and prepare you for upcoming challenges.</p>
+            </div>
+        </div>
+    </div>
+    
+    <script src="js/bootstrap.bundle.min.js"></script>
+</body>
+</html>""",
+    'objectives': """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}: Learning Objectives</title>
+    <link rel="stylesheet" href="css/bootstrap.min.css">
+    <style>
+        .content-paragraph {{ line-height: 1.6; margin-bottom: 1rem; }}
+        .accordion-icon {{ transition: transform 0.2s; }}
+        .btn[aria-expanded="true"] .accordion-icon {{ transform: rotate(90deg); }}
+        .expand-all-btn {{ margin-bottom: 1rem; }}
+    </style>
+</head>
+<body>
+    <div class="container-fluid">
+        <h1>{title}: Learning Objectives</h1>
+        
+        <div class="expand-all-btn">
+            <button class="btn btn-outline-primary" id="expandAll">
+                <i class="fas fa-expand-arrows-alt"></i> Expand All
+            </button>
+            <button class="btn btn-outline-secondary ml-2" id="collapseAll">
+                <i class="fas fa-compress-arrows-alt"></i> Collapse All
+            </button>
+        </div>
+        
+        <div class="accordion" id="objectivesAccordion">
+            {accordion_items}
+        </div>
+    </div>
+    
+    <script src="js/bootstrap.bundle.min.js"></script>
+</body>
+</html>""",
+    'content': """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}: {section_title}</title>
+    <link rel="stylesheet" href="css/bootstrap.min.css">
+    <style>
+        .content-paragraph {{ line-height: 1.6; margin-bottom: 1rem; }}
+        .section-content {{ padding: 2rem 0; }}
+    </style>
+</head>
+<body>
+    <div class="container-fluid section-content">
+        <h1>{section_title}</h1>
+        <div class="content-paragraph">
+            {paragraphs}
+        </div>
+    </div>
+</body>
+</html>""",
+    'summary': """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}: Summary</title>
+    <link rel="stylesheet" href="css/bootstrap.min.css">
+    <style>
+        .content-paragraph {{ line-height: 1.6; margin-bottom: 1rem; }}
+        .summary-section {{ padding: 2rem 0; }}
+    </style>
+</head>
+<body>
+    <div class="container-fluid summary-section">
+        <h1>{title}: Summary</h1>
+        
+        <h2>Key Takeaways</h2>
+        <p class="content-paragraph">In this module, you explored important concepts and developed practical skills. The learning objectives were designed to build your understanding progressively.</p>
+        
+        <h2>What You've Learned</h2>
+        <ul>
+            {objective_items}
+        </ul>
+        
+        <h2>Next Steps</h2>
+        <p class="content-paragraph">Continue to the next module where you'll build upon these concepts and explore more advanced topics. Review the self-check activities to reinforce your learning.</p>
+    </div>
+</body>
+</html>""",
+    'selfcheck': """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}: Self-Check</title>
+    <link rel="stylesheet" href="css/bootstrap.min.css">
+    <style>
+        .content-paragraph {{ line-height: 1.6; margin-bottom: 1rem; }}
+        .self-check-section {{ padding: 2rem 0; }}
+        .activity-card {{ margin-bottom: 1.5rem; }}
+    </style>
+</head>
+<body>
+    <div class="container-fluid self-check-section">
+        <h1>{title}: Self-Check Activities</h1>
+        
+        <div class="card activity-card">
+            <div class="card-body">
+                <h3 class="card-title">Reflection Questions</h3>
+                <p class="content-paragraph">Take a moment to reflect on what you've learned in this module. Consider how these concepts apply to real-world situations.</p>
+                <ul>
+                    <li class="content-paragraph">What was the most important concept you learned?</li>
+                    <li class="content-paragraph">How does this knowledge connect to your previous understanding?</li>
+                    <li class="content-paragraph">What questions do you still have about this topic?</li>
+                </ul>
+            </div>
+        </div>
+        
+        <div class="card activity-card">
+            <div class="card-body">
+                <h3 class="card-title">Knowledge Check</h3>
+                <p class="content-paragraph">Test your understanding of the key concepts covered in this module.</p>
+                <p class="content-paragraph">Review the learning objectives and ensure you can explain each concept in your own words.</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>""",
+}
+
+# One card of the learning objectives accordion
+_ACCORDION_ITEM_TEMPLATE = """
+            <div class="card">
+                <div class="card-header" id="heading{index}">
+                    <h3 class="mb-0">
+                        <button class="btn btn-link btn-block text-left" type="button" data-toggle="collapse" 
+                                data-target="#collapse{index}" aria-expanded="false" aria-controls="collapse{index}">
+                            <i class="fas fa-chevron-right accordion-icon"></i>
+                            Learning Objective {number}
+                        </button>
+                    </h3>
+                </div>
+                <div id="collapse{index}" class="collapse" aria-labelledby="heading{index}" data-parent="#objectivesAccordion">
+                    <div class="card-body">
+                        <h4>{text}</h4>
+                        <p class="content-paragraph">{content}</p>
+                    </div>
+                </div>
+            </div>"""
+
+# Assessments added when a course provides none: (type, XML generator, payload)
+_DEFAULT_ASSESSMENTS = (
+    ('assignment', '_generate_d2l_assignment_xml', {
+        'title': 'Weekly Reflection Assignment',
+        'instructions': 'Complete a 500-word reflection on the key concepts covered in this module. Discuss how these concepts relate to your prior knowledge and future learning goals.',
+        'points': 100
+    }),
+    ('discussion', '_generate_d2l_discussion_xml', {
+        'title': 'Discussion Forum: Course Concepts',
+        'instructions': 'Share your thoughts on this module\'s content. Respond to at least two classmates\' posts with substantive comments.',
+        'points': 50
+    }),
+    ('quiz', '_generate_qti_xml', {
+        'title': 'Knowledge Check Quiz',
+        'instructions': 'Test your understanding of the key concepts from this module.',
+        'points': 25
+    }),
+)
+_DEFAULT_ID_PLACEHOLDER = "{assessment_id}"
+
+# Shared page assets. Every package ships the same files, so they are encoded
+# once here instead of for each archive.
+_OFFLINE_CSS = """/* Minimal Bootstrap CSS for offline compatibility */
+.container-fluid { width: 100%; padding: 0 15px; }
+.card { border: 1px solid #dee2e6; border-radius: 0.25rem; margin-bottom: 1rem; }
+.card-header { padding: 0.75rem 1.25rem; background-color: #f8f9fa; border-bottom: 1px solid #dee2e6; }
+.card-body { padding: 1.25rem; }
+.btn { display: inline-block; padding: 0.375rem 0.75rem; margin-bottom: 0; font-size: 1rem; line-height: 1.5; text-align: center; white-space: nowrap; vertical-align: middle; cursor: pointer; border: 1px solid transparent; border-radius: 0.25rem; }
+.btn-primary { color: #fff; background-color: #007bff; border-color: #007bff; }
+.btn-outline-primary { color: #007bff; background-color: transparent; border-color: #007bff; }
+.btn-link { color: #007bff; background-color: transparent; text-decoration: none; }
+.btn-block { display: block; width: 100%; }
+.btn-outline-secondary { color: #6c757d; background-color: transparent; border-color: #6c757d; }
+.row { display: flex; flex-wrap: wrap; margin: 0 -15px; }
+.col-12 { flex: 0 0 100%; max-width: 100%; padding: 0 15px; }
+.lead { font-size: 1.25rem; font-weight: 300; }
+.card-title { margin-bottom: 0.75rem; }
+.text-left { text-align: left; }
+.mb-0 { margin-bottom: 0; }
+.ml-2 { margin-left: 0.5rem; }
+.collapse { display: none; }
+.collapse.show { display: block; }
+.content-paragraph { line-height: 1.6; margin-bottom: 1rem; }
+/* Glyphs standing in for the icon font used by the page markup */
+.fas { display: inline-block; font-style: normal; }
+.fa-chevron-right::before { content: "\\25B8"; }
+.fa-chevron-down::before { content: "\\25BE"; }
+.fa-expand-arrows-alt::before { content: "\\2922"; }
+.fa-compress-arrows-alt::before { content: "\\2921"; }"""
+_OFFLINE_JS = """/* Minimal accordion functionality for offline compatibility */
+document.addEventListener('DOMContentLoaded', function() {
+    // Basic accordion toggle functionality
+    const accordionButtons = document.querySelectorAll('[data-toggle="collapse"]');
+    accordionButtons.forEach(button => {
+        button.addEventListener('click', function() {
+            const target = document.querySelector(this.getAttribute('data-target'));
+            if (target) {
+                target.classList.toggle('show');
+                const icon = this.querySelector('.accordion-icon');
+                if (icon) {
+                    icon.classList.toggle('fa-chevron-right');
+                    icon.classList.toggle('fa-chevron-down');
+                }
+            }
+        });
+    });
+    
+    // Expand/Collapse all functionality
+    const expandAll = document.getElementById('expandAll');
+    const collapseAll = document.getElementById('collapseAll');
+    
+    if (expandAll) {
+        expandAll.addEventListener('click', function() {
+            document.querySelectorAll('.collapse').forEach(el => el.classList.add('show'));
+        });
+    }
+    
+    if (collapseAll) {
+        collapseAll.addEventListener('click', function() {
+            document.querySelectorAll('.collapse').forEach(el => el.classList.remove('show'));
+        });
+    }
+});"""
+_OFFLINE_ASSET_BYTES = (
+    (_CSS_ASSET, _OFFLINE_CSS.encode('utf-8')),
+    (_JS_ASSET, _OFFLINE_JS.encode('utf-8')),
+)
+
 
 class BrightspacePackager:
     """
     Enhanced Brightspace Package Generator with export directory management
     """
     
+    # Rendered default assessment XML keyed by (assignment, discussion) namespace
+    _default_templates_cache: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+    
     def __init__(self, project_root: str = None):
         # Default to COURSEFORGE_PATH env var or relative path from script location
         if project_root is None:
@@ -54,13 +699,13 @@ class BrightspacePackager:
             'webcontent': 'webcontent'
         }
         
-        # Bootstrap and framework versions
+        # Bootstrap and framework versions the page markup targets
         self.bootstrap_version = "4.3.1"
         self.fontawesome_version = "5.15.4"
         
         # Content parsing patterns (Enhanced from Debug Analysis)
-        self.objectives_pattern = r"## Learning Objectives?|Objectives?:?\s*\n((?:[-*]\s*.+\n?)+)"
-        self.content_section_pattern = r"## (.+?)\n(.*?)(?=##|\Z)"
+        self.objectives_pattern = _OBJECTIVES_RE.pattern
+        self.content_section_pattern = _SECTION_RE.pattern
         self.template_variable_pattern = r"\{[^}]+\}"  # Detect unresolved template variables
         
         # Debug fixes for known failure patterns
@@ -68,6 +713,11 @@ class BrightspacePackager:
         self.content_min_length = 50  # Minimum content length per section
         self.remove_hardcoded_refs = True  # Remove textbook references
         
+        # Internal identifiers only need to be unique within one package, so
+        # they are a per-packager random prefix plus a counter
+        self._id_prefix = secrets.token_hex(8)
+        self._id_counter = itertools.count()
+        
         # Export configuration
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.export_directory = None
@@ -77,6 +727,10 @@ class BrightspacePackager:
         self.schema_validation_required = True
         self.content_accuracy_check = True
         
+    def _new_id(self) -> str:
+        """Return a package-unique identifier for objectives, sections and assessments"""
+        return f"{self._id_prefix}-{next(self._id_counter):08x}"
+    
     def create_export_directory(self) -> str:
         """
         Create timestamped export directory structure with folder multiplication prevention
@@ -84,36 +738,28 @@ class BrightspacePackager:
         Returns:
             str: Path to created export directory
         """
-        # CRITICAL: Pre-flight collision detection with immediate termination
-        self.export_directory = self.exports_path / self.timestamp
-        
-        if self.export_directory.exists():
-            import logging
-            logging.critical(f"COLLISION DETECTED: {self.export_directory} exists - TERMINATING")
-            raise SystemExit("FOLDER MULTIPLICATION PREVENTION: Export collision detected")
-        
-        # Check for timestamp collision in any existing export directories
-        if self.exports_path.exists():
-            existing_dirs = [d.name for d in self.exports_path.iterdir() if d.is_dir()]
-            if self.timestamp in existing_dirs:
-                logging.critical(f"TIMESTAMP COLLISION: {self.timestamp} already used")
-                # Generate new timestamp and retry once
-                import time
-                time.sleep(1)
-                self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                self.export_directory = self.exports_path / self.timestamp
-                
-                # Final collision check
-                if self.export_directory.exists():
-                    raise SystemExit("TIMESTAMP COLLISION: Unable to generate unique timestamp")
-        
         # Auto-create exports folder if it doesn't exist
         if not self.exports_path.exists():
             self.exports_path.mkdir(parents=True, exist_ok=True)
             print(f"Created exports directory: {self.exports_path}")
         
-        # Create timestamped subdirectory
-        self.export_directory.mkdir(parents=True, exist_ok=False)  # Fail if exists
+        # CRITICAL: Collision detection is the atomic mkdir itself - it fails
+        # if the timestamped directory already exists, with no check/create race
+        self.export_directory = self.exports_path / self.timestamp
+        try:
+            self.export_directory.mkdir(exist_ok=False)  # Fail if exists
+        except FileExistsError:
+            logging.critical(f"TIMESTAMP COLLISION: {self.timestamp} already used")
+            # Generate new timestamp and retry once; a nanosecond clock
+            # suffix makes it distinct without sleeping into the next second
+            self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S") + f"_{time.time_ns() & 0xFFFFFF:06x}"
+            self.export_directory = self.exports_path / self.timestamp
+            
+            # Final collision check
+            try:
+                self.export_directory.mkdir(exist_ok=False)
+            except FileExistsError:
+                raise SystemExit("TIMESTAMP COLLISION: Unable to generate unique timestamp")
         
         print(f"Created export directory: {self.export_directory}")
         return str(self.export_directory)
@@ -160,15 +806,14 @@ class BrightspacePackager:
         # Parse settings.json
         settings_path = course_path / "settings.json"
         if settings_path.exists():
-            with open(settings_path, 'r') as f:
-                course_structure["settings"] = json.load(f)
+            with open(settings_path, 'rb') as f:
+                course_structure["settings"] = _load_json_bytes(f.read())
         
         return course_structure
     
     def _parse_course_info(self, course_info_path: Path) -> Dict:
         """Parse course_info.md file"""
-        with open(course_info_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = self._read_text(course_info_path)
         
         info = {
             "title": "Untitled Course",
@@ -177,24 +822,19 @@ class BrightspacePackager:
         }
         
         # Extract title (first h1)
-        title_match = re.search(r"^# (.+)$", content, re.MULTILINE)
+        title_match = _TITLE_RE.search(content)
         if title_match:
             info["title"] = title_match.group(1).strip()
         
         # Extract description (content after title until objectives)
-        desc_match = re.search(r"^# .+?\n\n(.+?)(?=## |$)", content, re.DOTALL | re.MULTILINE)
+        desc_match = _DESCRIPTION_RE.search(content)
         if desc_match:
             info["description"] = desc_match.group(1).strip()
         
         # Extract objectives
-        objectives_match = re.search(self.objectives_pattern, content, re.DOTALL)
+        objectives_match = _OBJECTIVES_RE.search(content)
         if objectives_match:
-            objectives_text = objectives_match.group(1)
-            info["objectives"] = [
-                line.strip().lstrip('- *') 
-                for line in objectives_text.split('\n') 
-                if line.strip() and not line.strip().startswith('#')
-            ]
+            info["objectives"] = _objective_lines(objectives_match.group(1))
         
         return info
     
@@ -202,19 +842,50 @@ class BrightspacePackager:
         """Parse all module markdown files"""
         modules = []
         
-        for module_file in sorted(modules_path.glob("module_*.md")):
-            module_data = self._parse_single_module(module_file)
+        with os.scandir(modules_path) as entries:
+            module_files = sorted(
+                Path(entry.path) for entry in entries
+                if entry.name.startswith("module_") and entry.name.endswith(".md") and entry.is_file()
+            )
+        
+        # Parsing stays sequential and in order once the reads complete
+        for module_file, content in zip(module_files, self._read_texts(module_files)):
+            module_data = self._parse_module_content(module_file, content)
             if module_data:
                 modules.append(module_data)
         
         return modules
     
+    @staticmethod
+    def _read_text(path: Path) -> str:
+        """
+        Read a UTF-8 markdown source file in one call
+        
+        Every markdown source goes through here so each file is read exactly
+        once and then parsed from the in-memory string.
+        """
+        return path.read_text(encoding='utf-8')
+    
+    def _read_texts(self, paths: List[Path]) -> List[str]:
+        """
+        Read several markdown files with overlapping I/O
+        
+        Returns:
+            List[str]: File contents in the same order as paths
+        """
+        if len(paths) < 2:
+            return [self._read_text(path) for path in paths]
+        
+        with ThreadPoolExecutor(max_workers=_READ_WORKERS) as executor:
+            return list(executor.map(self._read_text, paths))
+    
     def _parse_single_module(self, module_path: Path) -> Dict:
         """Parse individual module markdown file"""
-        with open(module_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        module_number = re.search(r"module_(\d+)", module_path.name)
+        return self._parse_module_content(module_path, self._read_text(module_path))
+    
+    def _parse_module_content(self, module_path: Path, content: str) -> Dict:
+        """Parse module markdown that has already been read from module_path"""
+        module_number = _MODULE_NUMBER_RE.search(module_path.name)
         module_num = module_number.group(1) if module_number else "01"
         
         module = {
@@ -228,55 +899,61 @@ class BrightspacePackager:
         }
         
         # Extract module title (first h1)
-        title_match = re.search(r"^# (.+)$", content, re.MULTILINE)
+        title_match = _TITLE_RE.search(content)
         if title_match:
             module["title"] = title_match.group(1).strip()
         
         # Extract learning objectives
-        objectives_match = re.search(self.objectives_pattern, content, re.DOTALL)
+        objectives_match = _OBJECTIVES_RE.search(content)
         if objectives_match:
-            objectives_text = objectives_match.group(1)
+            # Split the module once and share the lines across all objectives
+            lines = content.split('\n')
+            lines_lower = [line.lower() for line in lines]
             module["objectives"] = [
                 {
-                    "id": str(uuid.uuid4()),
-                    "text": line.strip().lstrip('- *'),
-                    "content": self._extract_objective_content(content, line.strip().lstrip('- *'))
+                    "id": self._new_id(),
+                    "text": objective_text,
+                    "content": self._extract_objective_content(lines, lines_lower, objective_text)
                 }
-                for line in objectives_text.split('\n') 
-                if line.strip() and not line.strip().startswith('#')
+                for objective_text in _objective_lines(objectives_match.group(1))
             ]
         
         # Extract content sections
-        sections = re.findall(self.content_section_pattern, content, re.DOTALL)
+        sections = _SECTION_RE.findall(content)
         for section_title, section_content in sections:
             if "objective" not in section_title.lower():
                 module["content_sections"].append({
-                    "id": str(uuid.uuid4()),
+                    "id": self._new_id(),
                     "title": section_title.strip(),
                     "content": self._clean_content(section_content)
                 })
         
         return module
     
-    def _extract_objective_content(self, module_content: str, objective_text: str) -> str:
+    def _extract_objective_content(self, content_lines: List[str], lines_lower: List[str], objective_text: str) -> str:
         """
         Enhanced objective content extraction with robust parsing (Debug Pattern 5 Fix)
+        
+        Args:
+            content_lines: Module markdown split into lines
+            lines_lower: The same lines lowercased
+            objective_text: Objective to locate in the module
         """
         # Multi-pass content extraction approach
-        content_lines = module_content.split('\n')
         extracted_content = []
+        objective_lower = objective_text.lower()
         
         # Method 1: Look for content immediately following the objective
         objective_found = False
-        for i, line in enumerate(content_lines):
-            if objective_text.lower() in line.lower():
+        for i, line_lower in enumerate(lines_lower):
+            if line_lower.find(objective_lower) != -1:
                 objective_found = True
                 # Extract next 15 lines or until next section
                 for j in range(i+1, min(i+15, len(content_lines))):
                     current_line = content_lines[j].strip()
                     if current_line and not current_line.startswith('#'):
                         # Skip bullet points and markdown formatting
-                        clean_line = re.sub(r'^[-*]\s*', '', current_line)
+                        clean_line = _BULLET_RE.sub('', current_line)
                         if len(clean_line) > 10:  # Only meaningful content
                             extracted_content.append(clean_line)
                     elif current_line.startswith('##'):
@@ -289,13 +966,13 @@ class BrightspacePackager:
             section_content = []
             in_objectives_section = False
             
-            for line in content_lines:
-                if 'objective' in line.lower() and line.startswith('#'):
+            for line, line_lower in zip(content_lines, lines_lower):
+                if line.startswith('#') and 'objective' in line_lower:
                     in_objectives_section = True
                 elif line.startswith('#') and in_objectives_section:
                     break
                 elif in_objectives_section and line.strip():
-                    clean_line = re.sub(r'^[-*]\s*', '', line.strip())
+                    clean_line = _BULLET_RE.sub('', line.strip())
                     if len(clean_line) > 20 and not clean_line.lower().startswith('objective'):
                         section_content.append(clean_line)
             
@@ -304,9 +981,10 @@ class BrightspacePackager:
         # Method 3: Generate contextual content if still empty
         if not extracted_content:
             # Create meaningful content based on the objective
-            objective_keywords = re.findall(r'\b\w{4,}\b', objective_text.lower())
-            if objective_keywords:
-                key_concept = objective_keywords[0].capitalize()
+            # Only the leading keyword is used, so stop at the first match
+            keyword_match = _KEYWORD_RE.search(objective_lower)
+            if keyword_match:
+                key_concept = keyword_match.group(0).capitalize()
                 extracted_content = [
                     f"This learning objective focuses on {key_concept} and its practical applications.",
                     f"Students will explore the fundamental principles underlying {key_concept} through interactive activities and real-world examples.",
@@ -323,52 +1001,8 @@ class BrightspacePackager:
         return result
     
     def _clean_content(self, content: str) -> str:
-        """Enhanced content cleaning and formatting for HTML generation (Debug Pattern 5 Fix)"""
-        if not content:
-            return ""
-        
-        # Step 1: Remove excessive whitespace and normalize line breaks
-        content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
-        content = re.sub(r'[ \t]+', ' ', content)  # Normalize spaces
-        
-        # Step 2: Clean markdown formatting that interferes with HTML
-        content = re.sub(r'^#{3,}\s*', '', content, flags=re.MULTILINE)  # Remove h3+ headers
-        content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)  # Bold to HTML
-        content = re.sub(r'\*(.*?)\*', r'<em>\1</em>', content)  # Italic to HTML
-        
-        # Step 3: Remove hardcoded references (Debug Pattern 5 Fix)
-        hardcoded_patterns = [
-            r'See chapter \d+.*?\.',
-            r'Reference:.*?textbook.*?\.',
-            r'As discussed in the.*?textbook.*?\.',
-            r'Chapter \d+ of the assigned reading.*?\.',
-            r'\[textbook reference\]',
-            r'Please refer to.*?textbook.*?\.'
-        ]
-        
-        for pattern in hardcoded_patterns:
-            content = re.sub(pattern, '', content, flags=re.IGNORECASE)
-        
-        # Step 4: Enhance content if too short
-        words = content.split()
-        if len(words) < 30:
-            # Add contextual enhancement
-            content += " This topic provides essential knowledge for understanding the broader concepts discussed throughout the course."
-        
-        # Step 5: Structure into proper paragraphs
-        paragraphs = content.split('\n\n')
-        enhanced_paragraphs = []
-        
-        for para in paragraphs:
-            para = para.strip()
-            if para:
-                # Ensure paragraph is substantial
-                para_words = para.split()
-                if len(para_words) < 15:
-                    para += " This concept builds upon previous learning and prepares students for more advanced topics."
-                enhanced_paragraphs.append(para)
-        
-        return '\n\n'.join(enhanced_paragraphs)
+        """Clean section markdown for HTML generation (see clean_content)"""
+        return clean_content(content)
     
     def _parse_assessments(self, assessments_path: Path) -> Dict:
         """Parse assessment files"""
@@ -378,22 +1012,30 @@ class BrightspacePackager:
             "discussions": []
         }
         
+        # Collect every assessment file first so all reads can overlap
+        assessment_files = []
         for assessment_type in assessments.keys():
             type_path = assessments_path / assessment_type
             if type_path.exists():
                 for assessment_file in type_path.glob("*.md"):
-                    assessment_data = self._parse_assessment_file(assessment_file, assessment_type)
-                    assessments[assessment_type].append(assessment_data)
+                    assessment_files.append((assessment_type, assessment_file))
+        
+        contents = self._read_texts([assessment_file for _, assessment_file in assessment_files])
+        
+        for (assessment_type, assessment_file), content in zip(assessment_files, contents):
+            assessment_data = self._parse_assessment_content(assessment_file, assessment_type, content)
+            assessments[assessment_type].append(assessment_data)
         
         return assessments
     
     def _parse_assessment_file(self, assessment_path: Path, assessment_type: str) -> Dict:
         """Parse individual assessment file"""
-        with open(assessment_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
+        return self._parse_assessment_content(assessment_path, assessment_type, self._read_text(assessment_path))
+    
+    def _parse_assessment_content(self, assessment_path: Path, assessment_type: str, content: str) -> Dict:
+        """Parse assessment markdown that has already been read from assessment_path"""
         assessment = {
-            "id": str(uuid.uuid4()),
+            "id": self._new_id(),
             "type": assessment_type,
             "file_path": assessment_path,
             "title": assessment_path.stem.replace('_', ' ').title(),
@@ -403,7 +1045,7 @@ class BrightspacePackager:
         }
         
         # Extract title
-        title_match = re.search(r"^# (.+)$", content, re.MULTILINE)
+        title_match = _TITLE_RE.search(content)
         if title_match:
             assessment["title"] = title_match.group(1).strip()
         
@@ -411,302 +1053,154 @@ class BrightspacePackager:
         assessment["instructions"] = self._clean_content(content)
         
         # Extract points if specified
-        points_match = re.search(r"points?:\s*(\d+)", content, re.IGNORECASE)
+        points_match = _POINTS_RE.search(content)
         if points_match:
             assessment["points"] = int(points_match.group(1))
         
         return assessment
     
-    def generate_html_objects(self, course_structure: Dict) -> Dict[str, str]:
+    def generate_html_objects(self, course_structure: Dict, max_workers: int = 1) -> Dict[str, str]:
         """
         Generate individual HTML objects for each learning objective with accordion functionality
         
+        Modules are rendered in-process by default. With max_workers above 1
+        they are rendered in that many worker processes instead, which only
+        pays off for very large courses: process start-up costs more than
+        rendering a typical course. Workers receive only the module and the
+        settings from _render_config() and build a plain BrightspacePackager,
+        so subclass overrides of _render_module or the _generate_* methods do
+        not apply on that path. Their console output is printed here in module
+        order.
+        
+        Args:
+            course_structure: Parsed course structure
+            max_workers: Worker process count (1 renders in-process)
+        
         Returns:
             Dict[str, str]: Mapping of object IDs to HTML content
         """
         html_objects = {}
+        modules = course_structure["modules"]
+        
+        if max_workers > 1 and len(modules) > 1:
+            config = self._render_config()
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                rendered_modules = []
+                for module_objects, output in executor.map(_render_module_in_worker, modules,
+                                                           itertools.repeat(config)):
+                    print(output, end="")
+                    rendered_modules.append(module_objects)
+        else:
+            rendered_modules = [self._render_module(module) for module in modules]
+        
+        # Merge in module order so object ordering matches sequential rendering
+        for module_objects in rendered_modules:
+            html_objects.update(module_objects)
         
-        for module in course_structure["modules"]:
-            module_num = module["number"]
-            
-            # Generate module overview
-            overview_id = f"module_{module_num}_overview"
-            html_objects[overview_id] = self._generate_module_overview(module)
+        return html_objects
+    
+    def _render_config(self) -> Dict:
+        """Picklable settings a worker process needs to render modules like this packager"""
+        return {
+            'project_root': str(self.project_root),
+            'content_accuracy_check': self.content_accuracy_check,
+            'remove_hardcoded_refs': self.remove_hardcoded_refs,
+            'enable_pre_flight_checks': self.enable_pre_flight_checks,
+        }
+    
+    def _render_module(self, module: Dict) -> Dict[str, str]:
+        """Generate and validate all HTML objects for a single module"""
+        html_objects = {}
+        module_num = module["number"]
+        
+        # Generate module overview
+        overview_id = f"module_{module_num}_overview"
+        html_objects[overview_id] = self._generate_module_overview(module)
+        
+        # Generate objectives with accordion functionality
+        objectives_id = f"module_{module_num}_objectives"
+        html_objects[objectives_id] = self._generate_objectives_accordion(module)
+        
+        # Generate individual content objects with validation
+        for i, section in enumerate(module["content_sections"], 1):
+            content_id = f"module_{module_num}_content_{i:02d}"
+            # The checks below run on the substituted values only; the page
+            # template and its stylesheet are fixed markup
+            fields = self._content_object_fields(section, module)
             
-            # Generate objectives with accordion functionality
-            objectives_id = f"module_{module_num}_objectives"
-            html_objects[objectives_id] = self._generate_objectives_accordion(module)
+            # Validate content accuracy (Debug Pattern 5 Fix)
+            source_content = section.get('content', '')
+            page_content = f"{fields['section_title']}\n{fields['paragraphs']}"
+            if not self.validate_content_accuracy(page_content, source_content):
+                print(f"WARNING: Content accuracy issue in {content_id}")
             
-            # Generate individual content objects with validation
-            for i, section in enumerate(module["content_sections"], 1):
-                content_id = f"module_{module_num}_content_{i:02d}"
-                html_content = self._generate_content_object(section, module)
-                
-                # Validate content accuracy (Debug Pattern 5 Fix)
-                source_content = section.get('content', '')
-                if not self.validate_content_accuracy(html_content, source_content):
-                    print(f"WARNING: Content accuracy issue in {content_id}")
-                
-                # Remove hardcoded references (Debug Pattern 5 Fix)
-                html_content = self.remove_hardcoded_references(html_content)
-                
-                # Validate template variables (Debug Pattern 4 Fix)
-                if not self.validate_template_variables(html_content, content_id):
-                    print(f"ERROR: Template variable validation failed for {content_id}")
-                
-                html_objects[content_id] = html_content
+            # Remove hardcoded references (Debug Pattern 5 Fix)
+            fields = {key: self.remove_hardcoded_references(value) for key, value in fields.items()}
             
-            # Generate module summary
-            summary_id = f"module_{module_num}_summary"
-            html_objects[summary_id] = self._generate_module_summary(module)
+            # Validate template variables (Debug Pattern 4 Fix)
+            if not self.validate_template_variables("\n".join(fields.values()), content_id):
+                print(f"ERROR: Template variable validation failed for {content_id}")
             
-            # Generate self-check activities
-            selfcheck_id = f"module_{module_num}_selfcheck"
-            html_objects[selfcheck_id] = self._generate_selfcheck_activities(module)
+            html_objects[content_id] = _HTML_TEMPLATES['content'].format_map(fields)
+        
+        # Generate module summary
+        summary_id = f"module_{module_num}_summary"
+        html_objects[summary_id] = self._generate_module_summary(module)
+        
+        # Generate self-check activities
+        selfcheck_id = f"module_{module_num}_selfcheck"
+        html_objects[selfcheck_id] = self._generate_selfcheck_activities(module)
         
         return html_objects
     
     def _generate_module_overview(self, module: Dict) -> str:
         """Generate module overview HTML with proper page title formatting"""
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{module['title']}</title>
-    <link rel="stylesheet" href="https://stackpath.bootstrapcdn.com/bootstrap/{self.bootstrap_version}/css/bootstrap.min.css">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/{self.fontawesome_version}/css/all.min.css">
-    <style>
-        .content-paragraph {{ line-height: 1.6; margin-bottom: 1rem; }}
-        .module-header {{ background: #f8f9fa; padding: 2rem; border-radius: 0.5rem; margin-bottom: 2rem; }}
-    </style>
-</head>
-<body>
-    <div class="container-fluid">
-        <div class="module-header">
-            <h1>{module['title']}</h1>
-            <p class="lead content-paragraph">Welcome to {module['title']}. This module will introduce you to key concepts and provide hands-on learning experiences.</p>
-        </div>
-        
-        <div class="row">
-            <div class="col-12">
-                <h2>Module Overview</h2>
-                <p class="content-paragraph">In this module, you will explore important topics and develop practical skills through interactive activities and assessments.</p>
-                
-                <h3>What You'll Learn</h3>
-                <p class="content-paragraph">By the end of this module, you will have gained valuable knowledge and skills that build upon previous learning and prepare you for upcoming challenges.</p>
-            </div>
-        </div>
-    </div>
-    
-    <script src="https://code.jquery.com/jquery-3.5.1.min.js"></script>
-    <script src="https://stackpath.bootstrapcdn.com/bootstrap/{self.bootstrap_version}/js/bootstrap.bundle.min.js"></script>
-</body>
-</html>"""
+        return _HTML_TEMPLATES['overview'].format_map({'title': module['title']})
     
     def _generate_objectives_accordion(self, module: Dict) -> str:
         """Generate learning objectives with Bootstrap accordion functionality"""
-        accordion_items = ""
-        
-        for i, objective in enumerate(module["objectives"]):
-            accordion_items += f"""
-            <div class="card">
-                <div class="card-header" id="heading{i}">
-                    <h3 class="mb-0">
-                        <button class="btn btn-link btn-block text-left" type="button" data-toggle="collapse" 
-                                data-target="#collapse{i}" aria-expanded="false" aria-controls="collapse{i}">
-                            <i class="fas fa-chevron-right accordion-icon"></i>
-                            Learning Objective {i+1}
-                        </button>
-                    </h3>
-                </div>
-                <div id="collapse{i}" class="collapse" aria-labelledby="heading{i}" data-parent="#objectivesAccordion">
-                    <div class="card-body">
-                        <h4>{objective['text']}</h4>
-                        <p class="content-paragraph">{objective['content']}</p>
-                    </div>
-                </div>
-            </div>"""
-        
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{module['title']}: Learning Objectives</title>
-    <link rel="stylesheet" href="https://stackpath.bootstrapcdn.com/bootstrap/{self.bootstrap_version}/css/bootstrap.min.css">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/{self.fontawesome_version}/css/all.min.css">
-    <style>
-        .content-paragraph {{ line-height: 1.6; margin-bottom: 1rem; }}
-        .accordion-icon {{ transition: transform 0.2s; }}
-        .btn[aria-expanded="true"] .accordion-icon {{ transform: rotate(90deg); }}
-        .expand-all-btn {{ margin-bottom: 1rem; }}
-    </style>
-</head>
-<body>
-    <div class="container-fluid">
-        <h1>{module['title']}: Learning Objectives</h1>
-        
-        <div class="expand-all-btn">
-            <button class="btn btn-outline-primary" id="expandAll">
-                <i class="fas fa-expand-arrows-alt"></i> Expand All
-            </button>
-            <button class="btn btn-outline-secondary ml-2" id="collapseAll">
-                <i class="fas fa-compress-arrows-alt"></i> Collapse All
-            </button>
-        </div>
+        accordion_items = "".join(
+            _ACCORDION_ITEM_TEMPLATE.format_map({
+                'index': i,
+                'number': i + 1,
+                'text': objective['text'],
+                'content': objective['content']
+            })
+            for i, objective in enumerate(module["objectives"])
+        )
         
-        <div class="accordion" id="objectivesAccordion">
-            {accordion_items}
-        </div>
-    </div>
-    
-    <script src="https://code.jquery.com/jquery-3.5.1.min.js"></script>
-    <script src="https://stackpath.bootstrapcdn.com/bootstrap/{self.bootstrap_version}/js/bootstrap.bundle.min.js"></script>
-    <script>
-        $(document).ready(function() {{
-            $('#expandAll').click(function() {{
-                $('.collapse').collapse('show');
-            }});
-            
-            $('#collapseAll').click(function() {{
-                $('.collapse').collapse('hide');
-            }});
-            
-            $('.collapse').on('show.bs.collapse', function() {{
-                $(this).prev().find('.accordion-icon').removeClass('fa-chevron-right').addClass('fa-chevron-down');
-            }});
-            
-            $('.collapse').on('hide.bs.collapse', function() {{
-                $(this).prev().find('.accordion-icon').removeClass('fa-chevron-down').addClass('fa-chevron-right');
-            }});
-        }});
-    </script>
-</body>
-</html>"""
+        return _HTML_TEMPLATES['objectives'].format_map({
+            'title': module['title'],
+            'accordion_items': accordion_items
+        })
     
-    def _generate_content_object(self, section: Dict, module: Dict) -> str:
-        """Generate individual content object with proper formatting"""
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{module['title']}: {section['title']}</title>
-    <link rel="stylesheet" href="https://stackpath.bootstrapcdn.com/bootstrap/{self.bootstrap_version}/css/bootstrap.min.css">
-    <style>
-        .content-paragraph {{ line-height: 1.6; margin-bottom: 1rem; }}
-        .section-content {{ padding: 2rem 0; }}
-    </style>
-</head>
-<body>
-    <div class="container-fluid section-content">
-        <h1>{section['title']}</h1>
-        <div class="content-paragraph">
-            {self._format_content_paragraphs(section['content'])}
-        </div>
-    </div>
-</body>
-</html>"""
+    def _content_object_fields(self, section: Dict, module: Dict) -> Dict[str, str]:
+        """
+        Values substituted into the content object template
+        
+        This is the hook for customizing content pages: _render_module checks
+        these values and then fills the fixed page template with them.
+        """
+        return {
+            'title': module['title'],
+            'section_title': section['title'],
+            'paragraphs': self._format_content_paragraphs(section['content'])
+        }
     
     def _format_content_paragraphs(self, content: str) -> str:
-        """Format content into properly structured paragraphs (50-300 words)"""
-        paragraphs = content.split('\n\n')
-        formatted_paragraphs = []
-        
-        for paragraph in paragraphs:
-            if paragraph.strip():
-                # Ensure paragraph length is appropriate
-                words = paragraph.split()
-                if len(words) < 50:
-                    # Pad short paragraphs with additional context
-                    paragraph += " This concept is fundamental to understanding the broader principles discussed in this module."
-                elif len(words) > 300:
-                    # Split long paragraphs
-                    mid_point = len(words) // 2
-                    first_half = ' '.join(words[:mid_point])
-                    second_half = ' '.join(words[mid_point:])
-                    formatted_paragraphs.append(f'<p class="content-paragraph">{first_half}</p>')
-                    formatted_paragraphs.append(f'<p class="content-paragraph">{second_half}</p>')
-                    continue
-                
-                formatted_paragraphs.append(f'<p class="content-paragraph">{paragraph.strip()}</p>')
-        
-        return '\n'.join(formatted_paragraphs)
+        """Format content into paragraph markup (see format_content_paragraphs)"""
+        return format_content_paragraphs(content)
     
     def _generate_module_summary(self, module: Dict) -> str:
         """Generate module summary with review content"""
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{module['title']}: Summary</title>
-    <link rel="stylesheet" href="https://stackpath.bootstrapcdn.com/bootstrap/{self.bootstrap_version}/css/bootstrap.min.css">
-    <style>
-        .content-paragraph {{ line-height: 1.6; margin-bottom: 1rem; }}
-        .summary-section {{ padding: 2rem 0; }}
-    </style>
-</head>
-<body>
-    <div class="container-fluid summary-section">
-        <h1>{module['title']}: Summary</h1>
-        
-        <h2>Key Takeaways</h2>
-        <p class="content-paragraph">In this module, you explored important concepts and developed practical skills. The learning objectives were designed to build your understanding progressively.</p>
-        
-        <h2>What You've Learned</h2>
-        <ul>
-            {"".join(f'<li class="content-paragraph">{obj["text"]}</li>' for obj in module["objectives"])}
-        </ul>
-        
-        <h2>Next Steps</h2>
-        <p class="content-paragraph">Continue to the next module where you'll build upon these concepts and explore more advanced topics. Review the self-check activities to reinforce your learning.</p>
-    </div>
-</body>
-</html>"""
+        return _HTML_TEMPLATES['summary'].format_map({
+            'title': module['title'],
+            'objective_items': "".join(f'<li class="content-paragraph">{obj["text"]}</li>' for obj in module["objectives"])
+        })
     
     def _generate_selfcheck_activities(self, module: Dict) -> str:
         """Generate self-assessment activities"""
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{module['title']}: Self-Check</title>
-    <link rel="stylesheet" href="https://stackpath.bootstrapcdn.com/bootstrap/{self.bootstrap_version}/css/bootstrap.min.css">
-    <style>
-        .content-paragraph {{ line-height: 1.6; margin-bottom: 1rem; }}
-        .self-check-section {{ padding: 2rem 0; }}
-        .activity-card {{ margin-bottom: 1.5rem; }}
-    </style>
-</head>
-<body>
-    <div class="container-fluid self-check-section">
-        <h1>{module['title']}: Self-Check Activities</h1>
-        
-        <div class="card activity-card">
-            <div class="card-body">
-                <h3 class="card-title">Reflection Questions</h3>
-                <p class="content-paragraph">Take a moment to reflect on what you've learned in this module. Consider how these concepts apply to real-world situations.</p>
-                <ul>
-                    <li class="content-paragraph">What was the most important concept you learned?</li>
-                    <li class="content-paragraph">How does this knowledge connect to your previous understanding?</li>
-                    <li class="content-paragraph">What questions do you still have about this topic?</li>
-                </ul>
-            </div>
-        </div>
-        
-        <div class="card activity-card">
-            <div class="card-body">
-                <h3 class="card-title">Knowledge Check</h3>
-                <p class="content-paragraph">Test your understanding of the key concepts covered in this module.</p>
-                <p class="content-paragraph">Review the learning objectives and ensure you can explain each concept in your own words.</p>
-            </div>
-        </div>
-    </div>
-</body>
-</html>"""
+        return _HTML_TEMPLATES['selfcheck'].format_map({'title': module['title']})
     
     def generate_assessment_xml(self, assessments: Dict) -> Dict[str, str]:
         """
@@ -763,61 +1257,62 @@ class BrightspacePackager:
     def _validate_qti_xml(self, xml_content: str, assessment_id: str) -> bool:
         """Validate QTI XML structure for Brightspace compatibility"""
         try:
-            root = ET.fromstring(xml_content)
+            xml_bytes = xml_content.encode('utf-8')
+            _, tags, metadata_labels = _scan_xml_structure(xml_bytes)
             
             # Check required QTI elements
             required_elements = ['assessment', 'section', 'item']
             for element_name in required_elements:
-                if root.find(f".//{element_name}") is None:
+                if element_name not in tags:
                     print(f"❌ Missing required QTI element '{element_name}' in {assessment_id}")
                     return False
             
             # Check for points configuration
-            points_element = root.find(".//qtimetadatafield[fieldlabel='cc_points_possible']")
-            if points_element is None:
+            if 'cc_points_possible' not in metadata_labels:
                 print(f"❌ Missing points configuration in {assessment_id}")
                 return False
             
             print(f"✓ QTI XML validation passed for {assessment_id}")
             return True
             
-        except ET.ParseError as e:
+        except expat.ExpatError as e:
             print(f"❌ QTI XML parse error in {assessment_id}: {e}")
             return False
     
     def _validate_d2l_xml(self, xml_content: str, assessment_id: str) -> bool:
         """Validate assignment/discussion XML structure for Brightspace compatibility"""
         try:
-            root = ET.fromstring(xml_content)
+            xml_bytes = xml_content.encode('utf-8')
+            root_tag, tags, _ = _scan_xml_structure(xml_bytes)
+            root_namespace = root_tag[1:].partition('}')[0] if root_tag.startswith('{') else ''
 
             # Check for correct namespace based on assessment type
             if 'assignment' in assessment_id:
-                if self.assignment_namespace not in xml_content:
+                if root_namespace != self.assignment_namespace:
                     print(f"❌ Missing correct assignment namespace in {assessment_id}")
                     return False
                 # Check for required assignment elements
-                if 'gradable' not in xml_content:
+                if f"{{{self.assignment_namespace}}}gradable" not in tags:
                     print(f"❌ Missing gradable element in {assessment_id}")
                     return False
             elif 'discussion' in assessment_id:
-                if self.discussion_namespace not in xml_content:
+                if root_namespace != self.discussion_namespace:
                     print(f"❌ Missing correct discussion namespace in {assessment_id}")
                     return False
                 # Check for <topic> root element (NOT <discussion>)
-                if root.tag != 'topic' and not root.tag.endswith('}topic'):
-                    print(f"❌ Discussion must use <topic> root element, not <{root.tag}> in {assessment_id}")
+                if root_tag != 'topic' and not root_tag.endswith('}topic'):
+                    print(f"❌ Discussion must use <topic> root element, not <{root_tag}> in {assessment_id}")
                     return False
 
             # Check for title element
-            title_element = root.find('.//{*}title')
-            if title_element is None:
+            if not any(tag == 'title' or tag.endswith('}title') for tag in tags):
                 print(f"❌ Missing title element in {assessment_id}")
                 return False
 
             print(f"✓ XML validation passed for {assessment_id}")
             return True
 
-        except ET.ParseError as e:
+        except expat.ExpatError as e:
             print(f"❌ XML parse error in {assessment_id}: {e}")
             return False
     
@@ -825,53 +1320,42 @@ class BrightspacePackager:
         """Generate default assessments to ensure course has functional assessment tools"""
         default_assessments = {}
         
-        # Default assignment
-        default_assignment = {
-            'id': str(uuid.uuid4()),
-            'title': 'Weekly Reflection Assignment',
-            'instructions': 'Complete a 500-word reflection on the key concepts covered in this module. Discuss how these concepts relate to your prior knowledge and future learning goals.',
-            'points': 100
-        }
-        
-        assignment_xml = self._generate_d2l_assignment_xml(default_assignment)
-        default_assessments[f"assignment_{default_assignment['id']}"] = assignment_xml
-        
-        # Default discussion
-        default_discussion = {
-            'id': str(uuid.uuid4()),
-            'title': 'Discussion Forum: Course Concepts',
-            'instructions': 'Share your thoughts on this module\'s content. Respond to at least two classmates\' posts with substantive comments.',
-            'points': 50
-        }
-        
-        discussion_xml = self._generate_d2l_discussion_xml(default_discussion)
-        default_assessments[f"discussion_{default_discussion['id']}"] = discussion_xml
-        
-        # Default quiz
-        default_quiz = {
-            'id': str(uuid.uuid4()),
-            'title': 'Knowledge Check Quiz',
-            'instructions': 'Test your understanding of the key concepts from this module.',
-            'points': 25
-        }
-        
-        quiz_xml = self._generate_qti_xml(default_quiz)
-        default_assessments[f"quiz_{default_quiz['id']}"] = quiz_xml
+        # The default payloads are fixed, so only the identifiers are filled in
+        for assessment_type, template in self._default_assessment_templates():
+            assessment_id = self._new_id()
+            default_assessments[f"{assessment_type}_{assessment_id}"] = template.replace(_DEFAULT_ID_PLACEHOLDER, assessment_id)
         
         print("✓ Generated default assessment structure (1 assignment, 1 discussion, 1 quiz)")
         return default_assessments
     
+    def _default_assessment_templates(self) -> List[Tuple[str, str]]:
+        """Default assessment XML with an identifier placeholder, rendered once per namespace set"""
+        key = (self.assignment_namespace, self.discussion_namespace)
+        templates = BrightspacePackager._default_templates_cache.get(key)
+        if templates is None:
+            templates = [
+                (assessment_type, getattr(self, generator)(dict(payload, id=_DEFAULT_ID_PLACEHOLDER)))
+                for assessment_type, generator, payload in _DEFAULT_ASSESSMENTS
+            ]
+            BrightspacePackager._default_templates_cache[key] = templates
+        return templates
+    
     def _generate_qti_xml(self, quiz: Dict) -> str:
         """Generate QTI 1.2 compliant XML for quiz"""
         # Escape title for XML attribute and instructions for XML content
         escaped_title = self._escape_xml(quiz['title'])
         escaped_instructions = self._escape_xml(quiz['instructions'])
+        # Values used more than once in the document. The XML generators stay
+        # f-strings: they are compiled once and build the document in a single
+        # step, which measured ~10x faster than str.format_map on a template
+        quiz_id = quiz['id']
+        points = quiz['points']
 
         return f"""<?xml version="1.0" encoding="UTF-8"?>
 <questestinterop xmlns="http://www.imsglobal.org/xsd/ims_qtiasiv1p2"
                  xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
                  xsi:schemaLocation="http://www.imsglobal.org/xsd/ims_qtiasiv1p2 http://www.imsglobal.org/xsd/ims_qtiasiv1p2p1.xsd">
-    <assessment ident="assessment_{quiz['id']}" title="{escaped_title}">
+    <assessment ident="assessment_{quiz_id}" title="{escaped_title}">
         <qtimetadata>
             <qtimetadatafield>
                 <fieldlabel>cc_maxattempts</fieldlabel>
@@ -879,11 +1363,11 @@ class BrightspacePackager:
             </qtimetadatafield>
             <qtimetadatafield>
                 <fieldlabel>cc_points_possible</fieldlabel>
-                <fieldentry>{quiz['points']}</fieldentry>
+                <fieldentry>{points}</fieldentry>
             </qtimetadatafield>
         </qtimetadata>
         <section ident="root_section">
-            <item ident="item_{quiz['id']}_001" title="Question 1">
+            <item ident="item_{quiz_id}_001" title="Question 1">
                 <itemmetadata>
                     <qtimetadata>
                         <qtimetadatafield>
@@ -892,7 +1376,7 @@ class BrightspacePackager:
                         </qtimetadatafield>
                         <qtimetadatafield>
                             <fieldlabel>points_possible</fieldlabel>
-                            <fieldentry>{quiz['points']}</fieldentry>
+                            <fieldentry>{points}</fieldentry>
                         </qtimetadatafield>
                     </qtimetadata>
                 </itemmetadata>
@@ -908,7 +1392,7 @@ class BrightspacePackager:
                 </presentation>
                 <resprocessing>
                     <outcomes>
-                        <decvar maxvalue="{quiz['points']}" minvalue="0" varname="SCORE" vartype="Decimal"/>
+                        <decvar maxvalue="{points}" minvalue="0" varname="SCORE" vartype="Decimal"/>
                     </outcomes>
                 </resprocessing>
             </item>
@@ -952,116 +1436,163 @@ class BrightspacePackager:
         """
         Create comprehensive imsmanifest.xml with all content and assessment object references
         """
+        # The manifest identifier must stay unique across cartridges imported
+        # into the same LMS, so it does not come from the per-packager scheme
         manifest_id = str(uuid.uuid4())
         course_title = course_structure["course_info"].get("title", "Untitled Course")
         
+        schema_location = f"{self.imscc_namespace} http://www.imsglobal.org/xsd/imsccv1p3/imscp_v1p1.xsd"
+        SubElement = etree.SubElement
+
         # Create manifest root with IMS Common Cartridge 1.2.0 standardization (Debug Pattern 1 Fix)
-        manifest = ET.Element("manifest")
-        manifest.set("identifier", manifest_id)
-        manifest.set("version", self.imscc_version)  # CRITICAL: Explicit version declaration
-        manifest.set("xmlns", self.imscc_namespace)
-        manifest.set("xmlns:lom", "http://ltsc.ieee.org/xsd/imsccv1p3/LOM/resource")  # Corrected LOM namespace (v1p3)
-        manifest.set("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
-        manifest.set("xsi:schemaLocation", f"{self.imscc_namespace} http://www.imsglobal.org/xsd/imsccv1p3/imscp_v1p1.xsd")
+        if LXML_AVAILABLE:
+            # Namespaces are declared once on the root; elements use Clark notation
+            ns = f"{{{self.imscc_namespace}}}"
+            manifest = etree.Element(f"{ns}manifest", nsmap={
+                None: self.imscc_namespace,
+                'lom': LOM_NAMESPACE,  # Corrected LOM namespace (v1p3)
+                'xsi': XSI_NAMESPACE
+            })
+            manifest.set("identifier", manifest_id)
+            manifest.set("version", self.imscc_version)  # CRITICAL: Explicit version declaration
+            manifest.set(f"{{{XSI_NAMESPACE}}}schemaLocation", schema_location)
+        else:
+            ns = ""
+            manifest = etree.Element("manifest")
+            manifest.set("identifier", manifest_id)
+            manifest.set("version", self.imscc_version)  # CRITICAL: Explicit version declaration
+            manifest.set("xmlns", self.imscc_namespace)
+            manifest.set("xmlns:lom", LOM_NAMESPACE)  # Corrected LOM namespace (v1p3)
+            manifest.set("xmlns:xsi", XSI_NAMESPACE)
+            manifest.set("xsi:schemaLocation", schema_location)
+        
+        # Tag names used inside the loops, built once: lxml parses a
+        # {namespace}tag string on every call it is given
+        item_tag, title_tag = f"{ns}item", f"{ns}title"
+        resource_tag, file_tag, dependency_tag = f"{ns}resource", f"{ns}file", f"{ns}dependency"
         
         # Metadata with consistent schema version
-        metadata = ET.SubElement(manifest, "metadata")
-        schema = ET.SubElement(metadata, "schema")
+        metadata = SubElement(manifest, f"{ns}metadata")
+        schema = SubElement(metadata, f"{ns}schema")
         schema.text = "IMS Common Cartridge"
-        schemaversion = ET.SubElement(metadata, "schemaversion")
+        schemaversion = SubElement(metadata, f"{ns}schemaversion")
         schemaversion.text = self.imscc_version
         
         # Organizations
-        organizations = ET.SubElement(manifest, "organizations")
-        organization = ET.SubElement(organizations, "organization")
+        organizations = SubElement(manifest, f"{ns}organizations")
+        organization = SubElement(organizations, f"{ns}organization")
         organization.set("identifier", f"org_{manifest_id}")
         organization.set("structure", "rooted-hierarchy")
         
-        title_elem = ET.SubElement(organization, "title")
+        title_elem = SubElement(organization, f"{ns}title")
         title_elem.text = course_title
         
         # Resources
-        resources = ET.SubElement(manifest, "resources")
+        resources = SubElement(manifest, f"{ns}resources")
         
         # Add HTML content resources (with _R suffix for Brightspace compatibility)
-        for obj_id, html_content in html_objects.items():
-            resource = ET.SubElement(resources, "resource")
+        for obj_id in html_objects:
+            href = f"{obj_id}.html"
+            resource = SubElement(resources, resource_tag)
             resource.set("identifier", f"{obj_id}_R")
             resource.set("type", "webcontent")
-            resource.set("href", f"{obj_id}.html")
+            resource.set("href", href)
 
-            file_elem = ET.SubElement(resource, "file")
-            file_elem.set("href", f"{obj_id}.html")
+            file_elem = SubElement(resource, file_tag)
+            file_elem.set("href", href)
+            
+            dependency = SubElement(resource, dependency_tag)
+            dependency.set("identifierref", _ASSETS_RESOURCE_ID)
+        
+        # Shared stylesheet and script linked by the HTML content resources
+        assets_resource = SubElement(resources, resource_tag)
+        assets_resource.set("identifier", _ASSETS_RESOURCE_ID)
+        assets_resource.set("type", "webcontent")
+        for asset_path in _ASSET_FILES:
+            asset_elem = SubElement(assets_resource, file_tag)
+            asset_elem.set("href", asset_path)
 
         # Add assessment resources with correct IMSCC resource types (with _R suffix)
-        for assessment_id, xml_content in assessment_xml.items():
-            resource = ET.SubElement(resources, "resource")
+        for assessment_id in assessment_xml:
+            resource = SubElement(resources, resource_tag)
             resource.set("identifier", f"{assessment_id}_R")
 
-            if "quiz" in assessment_id.lower():
-                resource.set("type", self.resource_types['quiz'])
-                resource.set("href", f"{assessment_id}.xml")
-            elif "assignment" in assessment_id.lower():
-                resource.set("type", self.resource_types['assignment'])
-                resource.set("href", f"{assessment_id}.xml")
-            elif "discussion" in assessment_id.lower():
-                resource.set("type", self.resource_types['discussion'])
+            # generate_assessment_xml keys every document as <kind>_<id>, so
+            # the prefix names the type; other ids keep the substring match
+            kind = assessment_id.split("_", 1)[0]
+            if kind not in _ASSESSMENT_KINDS:
+                assessment_id_lower = assessment_id.lower()
+                kind = next((k for k in _ASSESSMENT_KINDS if k in assessment_id_lower), None)
+            if kind:
+                resource.set("type", self.resource_types[kind])
                 resource.set("href", f"{assessment_id}.xml")
 
-            file_elem = ET.SubElement(resource, "file")
+            file_elem = SubElement(resource, file_tag)
             file_elem.set("href", f"{assessment_id}.xml")
         
+        # Index object ids by every module_<number>_ they contain, in object
+        # order, so each module picks up its own ids without a full scan
+        content_ids_by_module: Dict[str, List[str]] = {}
+        for obj_id in html_objects:
+            for module_number in dict.fromkeys(_MODULE_OBJECT_RE.findall(obj_id)):
+                content_ids_by_module.setdefault(module_number, []).append(obj_id)
+        
+        # Resolve each assessment's module once instead of once per module
+        assessments_by_module: Dict[int, List[Tuple[str, str]]] = {}
+        module_index = _index_module_assessments(course_structure.get('modules', []))
+        for assessment_id, xml_content in assessment_xml.items():
+            assessment_module = self._get_assessment_module(assessment_id, course_structure, module_index)
+            assessments_by_module.setdefault(assessment_module, []).append((assessment_id, xml_content))
+        
         # Add organization items for content structure
         for module in course_structure["modules"]:
-            module_item = ET.SubElement(organization, "item")
+            module_item = SubElement(organization, item_tag)
             module_item.set("identifier", f"module_{module['number']}_item")
 
-            module_title = ET.SubElement(module_item, "title")
+            module_title = SubElement(module_item, title_tag)
             module_title.text = module["title"]
 
-            # Collect and sort content items for this module
-            module_content_ids = [
-                obj_id for obj_id in html_objects.keys()
-                if f"module_{module['number']}_" in obj_id
-            ]
-            sorted_content_ids = sorted(module_content_ids, key=self._get_content_sort_key)
+            # Collect and sort content items for this module. Sort keys end
+            # with the id itself, so sorting the keys orders the ids and
+            # their priority also picks the item title
+            module_content_ids = content_ids_by_module.get(str(module['number']), [])
+            sorted_content_keys = sorted(map(self._get_content_sort_key, module_content_ids))
 
             # Add sorted sub-items for each content object (with _R suffix for identifierref)
-            for obj_id in sorted_content_ids:
-                sub_item = ET.SubElement(module_item, "item")
+            for sort_key in sorted_content_keys:
+                priority = sort_key[0]
+                obj_id = sort_key[-1]
+                sub_item = SubElement(module_item, item_tag)
                 sub_item.set("identifier", f"{obj_id}_item")
                 sub_item.set("identifierref", f"{obj_id}_R")
 
-                sub_title = ET.SubElement(sub_item, "title")
-                if "overview" in obj_id.lower():
-                    sub_title.text = "Module Overview"
-                elif "objectives" in obj_id.lower():
-                    sub_title.text = "Learning Objectives"
-                elif "content" in obj_id.lower():
+                sub_title = SubElement(sub_item, title_tag)
+                if priority in _CONTENT_ITEM_TITLES:
+                    sub_title.text = _CONTENT_ITEM_TITLES[priority]
+                elif priority == _CONTENT_PRIORITY:
                     content_num = obj_id.split("_")[-1]
                     sub_title.text = f"Content Section {content_num}"
-                elif "summary" in obj_id.lower():
-                    sub_title.text = "Module Summary"
-                elif "selfcheck" in obj_id.lower() or "self_check" in obj_id.lower():
-                    sub_title.text = "Self-Check Activities"
                 else:
                     sub_title.text = obj_id.replace("_", " ").title()
 
             # Add assessment items to organization (CRITICAL: assessments must appear in navigation)
-            for assessment_id, xml_content in assessment_xml.items():
-                assessment_module = self._get_assessment_module(assessment_id, course_structure)
-                if assessment_module == module['number']:
-                    assessment_item = ET.SubElement(module_item, "item")
-                    assessment_item.set("identifier", f"{assessment_id}_item")
-                    assessment_item.set("identifierref", f"{assessment_id}_R")
+            for assessment_id, xml_content in assessments_by_module.get(module['number'], ()):
+                assessment_item = SubElement(module_item, item_tag)
+                assessment_item.set("identifier", f"{assessment_id}_item")
+                assessment_item.set("identifierref", f"{assessment_id}_R")
 
-                    assessment_title_elem = ET.SubElement(assessment_item, "title")
-                    assessment_title_elem.text = self._get_assessment_title(assessment_id, xml_content)
-        
-        # Generate manifest XML
-        manifest_xml = ET.tostring(manifest, encoding='unicode', method='xml')
-        
-        # Critical schema validation (Debug Pattern 1 Fix)
+                assessment_title_elem = SubElement(assessment_item, title_tag)
+                assessment_title_elem.text = self._get_assessment_title(assessment_id, xml_content)
+        
+        # Critical schema validation (Debug Pattern 1 Fix). The lxml tree is
+        # checked in memory before serialization; the fallback builder sets
+        # its namespaces as plain attributes, so its serialized text is parsed
+        if LXML_AVAILABLE:
+            if not self.validate_schema_compliance(manifest_root=manifest):
+                raise ValueError("Schema validation failed for manifest XML")
+            return etree.tostring(manifest, encoding='unicode')
+        
+        manifest_xml = etree.tostring(manifest, encoding='unicode')
         if not self.validate_schema_compliance(manifest_xml):
             raise ValueError("Schema validation failed for manifest XML")
         
@@ -1082,24 +1613,31 @@ class BrightspacePackager:
         manifest_xml = self.create_imsmanifest(course_structure, html_objects, assessment_xml)
         
         # Clean course name for file naming
-        clean_course_name = re.sub(r'[^a-zA-Z0-9_-]', '_', course_name)
+        clean_course_name = _FILENAME_UNSAFE_RE.sub('_', course_name)
         
         try:
             # ATOMIC PACKAGE GENERATION: Create files directly without intermediate structures
-            imscc_path = self.export_directory / f"{clean_course_name}.imscc"
-            d2l_path = self.export_directory / f"{clean_course_name}_d2l.zip"
+            imscc_path = str(self.export_directory / f"{clean_course_name}.imscc")
+            d2l_path = str(self.export_directory / f"{clean_course_name}_d2l.zip")
             
             # Create temp files for atomic operation
             temp_imscc = self.export_directory / f".{clean_course_name}.imscc.tmp"
             temp_d2l = self.export_directory / f".{clean_course_name}_d2l.zip.tmp"
             
-            # Generate packages to temp files
-            self._create_imscc_package(temp_imscc, manifest_xml, html_objects, assessment_xml)
-            self._create_d2l_package(temp_d2l, manifest_xml, html_objects, assessment_xml)
+            # Generate packages to temp files. The two archives share no state and
+            # zlib releases the GIL while compressing, so they are built side by side
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                package_futures = [
+                    executor.submit(self._create_imscc_package, temp_imscc, manifest_xml, html_objects, assessment_xml),
+                    executor.submit(self._create_d2l_package, temp_d2l, manifest_xml, html_objects, assessment_xml),
+                ]
+                for future in package_futures:
+                    future.result()
             
-            # Atomic rename to final files
-            temp_imscc.rename(imscc_path)
-            temp_d2l.rename(d2l_path)
+            # Atomic rename to final files; os.replace also overwrites an
+            # existing package on Windows, where Path.rename would fail
+            os.replace(temp_imscc, imscc_path)
+            os.replace(temp_d2l, d2l_path)
             
             # CRITICAL: Validate single output files only
             self._validate_single_output()
@@ -1108,12 +1646,11 @@ class BrightspacePackager:
             validation_path = self.export_directory / "validation_report.md"
             self._generate_validation_report(validation_path, course_structure, html_objects, assessment_xml)
             
-            return str(imscc_path), str(d2l_path)
+            return imscc_path, d2l_path
             
         except Exception as e:
             # Clean up any temp files on failure
             self._cleanup_temp_files()
-            import logging
             logging.critical(f"ATOMIC GENERATION FAILED: {e}")
             raise SystemExit(f"Package generation failed: {e}")
     
@@ -1124,33 +1661,39 @@ class BrightspacePackager:
         if not self.export_directory.exists():
             raise SystemExit("VALIDATION FAILED: Export directory does not exist")
         
-        files = list(self.export_directory.glob("*.imscc"))
-        d2l_files = list(self.export_directory.glob("*_d2l.zip"))
+        # Classify the export directory in one read; the suffix tests match
+        # what the *.imscc and *_d2l.zip globs selected
+        files, d2l_files, extracted_folders = [], [], []
+        with os.scandir(self.export_directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(".imscc"):
+                    files.append(name)
+                elif name.endswith("_d2l.zip"):
+                    d2l_files.append(name)
+                if entry.is_dir() and not name.startswith('.'):
+                    extracted_folders.append(name)
         
         if len(files) != 1:
-            import logging
             logging.critical(f"VALIDATION FAILED: {len(files)} .imscc files found, expected exactly 1")
             raise SystemExit("FOLDER MULTIPLICATION DETECTED: Multiple .imscc files created")
         
         if len(d2l_files) != 1:
-            import logging  
             logging.critical(f"VALIDATION FAILED: {len(d2l_files)} D2L files found, expected exactly 1")
             raise SystemExit("FOLDER MULTIPLICATION DETECTED: Multiple D2L files created")
         
         # Check for any numbered duplicates in parent directory
         parent_dir = self.export_directory.parent
         if parent_dir.exists():
-            duplicates = [f.name for f in parent_dir.iterdir() if '(' in f.name and ')' in f.name]
+            with os.scandir(parent_dir) as entries:
+                duplicates = [entry.name for entry in entries if '(' in entry.name and ')' in entry.name]
             if duplicates:
-                import logging
                 logging.critical(f"DUPLICATION DETECTED: {duplicates}")
                 raise SystemExit("FOLDER MULTIPLICATION VIOLATION: Numbered duplicates found")
         
         # Ensure no extracted folder contents exist
-        extracted_folders = [d for d in self.export_directory.iterdir() if d.is_dir() and not d.name.startswith('.')]
         if extracted_folders:
-            import logging
-            logging.critical(f"EXTRACTED CONTENT DETECTED: {[d.name for d in extracted_folders]}")
+            logging.critical(f"EXTRACTED CONTENT DETECTED: {extracted_folders}")
             raise SystemExit("FOLDER MULTIPLICATION VIOLATION: Extracted folder contents found")
         
         print("✓ Single output validation passed")
@@ -1163,93 +1706,56 @@ class BrightspacePackager:
     
     def _create_imscc_package(self, package_path: Path, manifest_xml: str, html_objects: Dict, assessment_xml: Dict):
         """Create IMS Common Cartridge package"""
-        with zipfile.ZipFile(package_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        date_time = time.localtime()[:6]  # one timestamp for every entry
+        with open(package_path, 'wb', buffering=_ZIP_BUFFER_SIZE) as package_file, \
+                zipfile.ZipFile(package_file, 'w', zipfile.ZIP_DEFLATED) as zip_file:
             # Add manifest
-            zip_file.writestr("imsmanifest.xml", manifest_xml)
+            _write_zip_text(zip_file, "imsmanifest.xml", manifest_xml, date_time)
             
             # Add HTML objects
             for obj_id, html_content in html_objects.items():
-                zip_file.writestr(f"{obj_id}.html", html_content)
+                _write_zip_text(zip_file, f"{obj_id}.html", html_content, date_time)
             
             # Add assessment XML
             for assessment_id, xml_content in assessment_xml.items():
-                zip_file.writestr(f"{assessment_id}.xml", xml_content)
-            
-            # Add CSS/JS dependencies with CDN fallbacks
-            css_content = self._generate_offline_css()
-            js_content = self._generate_offline_js()
+                _write_zip_text(zip_file, f"{assessment_id}.xml", xml_content, date_time)
             
-            zip_file.writestr("css/bootstrap.min.css", css_content)
-            zip_file.writestr("js/bootstrap.bundle.min.js", js_content)
+            # Add the shared CSS/JS assets linked by every HTML object
+            for asset_path, asset_bytes in _OFFLINE_ASSET_BYTES:
+                _write_zip_bytes(zip_file, asset_path, asset_bytes, date_time)
     
     def _create_d2l_package(self, package_path: Path, manifest_xml: str, html_objects: Dict, assessment_xml: Dict):
         """Create D2L Export package"""
-        with zipfile.ZipFile(package_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        date_time = time.localtime()[:6]  # one timestamp for every entry
+        with open(package_path, 'wb', buffering=_ZIP_BUFFER_SIZE) as package_file, \
+                zipfile.ZipFile(package_file, 'w', zipfile.ZIP_DEFLATED) as zip_file:
             # Add manifest
-            zip_file.writestr("imsmanifest.xml", manifest_xml)
+            _write_zip_text(zip_file, "imsmanifest.xml", manifest_xml, date_time)
             
             # Add HTML objects
             for obj_id, html_content in html_objects.items():
-                zip_file.writestr(f"content/{obj_id}.html", html_content)
+                _write_zip_text(zip_file, f"content/{obj_id}.html", html_content, date_time)
             
             # Add assessment XML
             for assessment_id, xml_content in assessment_xml.items():
-                zip_file.writestr(f"assessments/{assessment_id}.xml", xml_content)
+                _write_zip_text(zip_file, f"assessments/{assessment_id}.xml", xml_content, date_time)
+            
+            # Add the shared page assets next to the HTML objects that link them
+            for asset_path, asset_bytes in _OFFLINE_ASSET_BYTES:
+                _write_zip_bytes(zip_file, f"content/{asset_path}", asset_bytes, date_time)
     
     def _generate_offline_css(self) -> str:
         """Generate minimal Bootstrap CSS for offline functionality"""
-        return """/* Minimal Bootstrap CSS for offline compatibility */
-.container-fluid { width: 100%; padding: 0 15px; }
-.card { border: 1px solid #dee2e6; border-radius: 0.25rem; margin-bottom: 1rem; }
-.card-header { padding: 0.75rem 1.25rem; background-color: #f8f9fa; border-bottom: 1px solid #dee2e6; }
-.card-body { padding: 1.25rem; }
-.btn { display: inline-block; padding: 0.375rem 0.75rem; margin-bottom: 0; font-size: 1rem; line-height: 1.5; text-align: center; white-space: nowrap; vertical-align: middle; cursor: pointer; border: 1px solid transparent; border-radius: 0.25rem; }
-.btn-primary { color: #fff; background-color: #007bff; border-color: #007bff; }
-.btn-outline-primary { color: #007bff; background-color: transparent; border-color: #007bff; }
-.collapse { display: none; }
-.collapse.show { display: block; }
-.content-paragraph { line-height: 1.6; margin-bottom: 1rem; }"""
+        return _OFFLINE_CSS
     
     def _generate_offline_js(self) -> str:
         """Generate minimal JavaScript for accordion functionality"""
-        return """/* Minimal accordion functionality for offline compatibility */
-document.addEventListener('DOMContentLoaded', function() {
-    // Basic accordion toggle functionality
-    const accordionButtons = document.querySelectorAll('[data-toggle="collapse"]');
-    accordionButtons.forEach(button => {
-        button.addEventListener('click', function() {
-            const target = document.querySelector(this.getAttribute('data-target'));
-            if (target) {
-                target.classList.toggle('show');
-                const icon = this.querySelector('.accordion-icon');
-                if (icon) {
-                    icon.classList.toggle('fa-chevron-right');
-                    icon.classList.toggle('fa-chevron-down');
-                }
-            }
-        });
-    });
-    
-    // Expand/Collapse all functionality
-    const expandAll = document.getElementById('expandAll');
-    const collapseAll = document.getElementById('collapseAll');
-    
-    if (expandAll) {
-        expandAll.addEventListener('click', function() {
-            document.querySelectorAll('.collapse').forEach(el => el.classList.add('show'));
-        });
-    }
-    
-    if (collapseAll) {
-        collapseAll.addEventListener('click', function() {
-            document.querySelectorAll('.collapse').forEach(el => el.classList.remove('show'));
-        });
-    }
-});"""
+        return _OFFLINE_JS
     
     def _generate_validation_report(self, report_path: Path, course_structure: Dict, html_objects: Dict, assessment_xml: Dict):
         """Generate validation report for package quality assurance"""
-        report_content = f"""# Package Validation Report
+        # Sections are collected and joined once rather than grown with +=
+        report_parts = [f"""# Package Validation Report
 Generated: {datetime.now().isoformat()}
 Export Directory: {self.export_directory}
 
@@ -1260,16 +1766,14 @@ Export Directory: {self.export_directory}
 - Assessment Objects: {len(assessment_xml)}
 
 ## Content Objects Summary
-"""
+"""]
         
-        for obj_id in sorted(html_objects.keys()):
-            report_content += f"- {obj_id}.html\n"
+        report_parts.extend(f"- {obj_id}.html\n" for obj_id in sorted(html_objects))
         
-        report_content += "\n## Assessment Objects Summary\n"
-        for assessment_id in sorted(assessment_xml.keys()):
-            report_content += f"- {assessment_id}.xml\n"
+        report_parts.append("\n## Assessment Objects Summary\n")
+        report_parts.extend(f"- {assessment_id}.xml\n" for assessment_id in sorted(assessment_xml))
         
-        report_content += f"""
+        report_parts.append(f"""
 ## Validation Checklist
 - [x] Export directory created: {self.export_directory}
 - [x] IMSCC package generated
@@ -1286,10 +1790,9 @@ Export Directory: {self.export_directory}
 
 ## Notes
 This package was generated using the enhanced Brightspace Package Generator with full export directory management and WCAG 2.2 AA accessibility compliance.
-"""
+""")
         
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        report_path.write_text("".join(report_parts), encoding='utf-8')
     
     def validate_template_variables(self, content: str, file_path: str = "") -> bool:
         """
@@ -1305,23 +1808,11 @@ This package was generated using the enhanced Brightspace Package Generator with
         if not self.enable_pre_flight_checks:
             return True
         
-        # Enhanced patterns for comprehensive detection
-        patterns_to_check = [
-            r'\{[^}]+\}',           # Standard curly brace variables
-            r'\$\{[^}]+\}',         # Shell-style variables 
-            r'{{[^}]+}}',           # Double curly braces
-            r'\[placeholder\]',     # Bracket placeholders
-            r'MODULE_\d+',          # Module number placeholders
-            r'WEEK_\d+',           # Week number placeholders
-        ]
-        
-        all_unresolved = []
-        for pattern in patterns_to_check:
-            matches = re.findall(pattern, content)
-            all_unresolved.extend(matches)
-        
+        return self._report_template_variables(_find_template_variables(content), file_path)
+    
+    def _report_template_variables(self, all_unresolved: List[str], file_path: str) -> bool:
+        """Report the outcome of a template variable scan; True if nothing was left unresolved"""
         if all_unresolved:
-            import logging
             logging.critical(f"TEMPLATE VARIABLE VALIDATION FAILED: {file_path}")
             logging.critical(f"Unresolved variables: {all_unresolved}")
             print(f"❌ ERROR: Unresolved template variables in {file_path}: {all_unresolved}")
@@ -1343,49 +1834,74 @@ This package was generated using the enhanced Brightspace Package Generator with
         """
         print("Running comprehensive pre-flight validation...")
         
-        validation_results = []
+        passed = total = 0
         
-        # 1. Template variable validation for all HTML objects
+        # 1. Template variable validation for all HTML objects (CSS rule
+        # bodies in the page styles are not template variables). Identical
+        # pages, such as repeated stubs, are scanned once but every object
+        # is still reported under its own id
+        unresolved_by_page: Dict[str, List[str]] = {}
         for obj_id, html_content in html_objects.items():
-            if not self.validate_template_variables(html_content, obj_id):
-                validation_results.append(False)
-            else:
-                validation_results.append(True)
-        
-        # 2. File reference validation
+            total += 1
+            if not self.enable_pre_flight_checks:
+                passed += 1
+                continue
+            unresolved = unresolved_by_page.get(html_content)
+            if unresolved is None:
+                unresolved = _find_template_variables(_STYLE_BLOCK_RE.sub('', html_content))
+                unresolved_by_page[html_content] = unresolved
+            if self._report_template_variables(unresolved, obj_id):
+                passed += 1
+        
+        # 2. File reference validation. Each directory is listed once and
+        # files are looked up by name rather than stat'ed one at a time
+        directory_names: Dict[Path, frozenset] = {}
         for module in course_structure.get('modules', []):
             module_path = module.get('file_path')
-            if module_path and not module_path.exists():
+            total += 1
+            if module_path:
+                module_dir = module_path.parent
+                if module_dir not in directory_names:
+                    directory_names[module_dir] = _directory_names(module_dir)
+            if module_path and module_path.name not in directory_names[module_dir]:
                 print(f"❌ ERROR: Module file not found: {module_path}")
-                validation_results.append(False)
             else:
-                validation_results.append(True)
+                passed += 1
         
-        # 3. Content length validation
+        # 3. Content length validation, again once per distinct page
+        word_counts: Dict[str, int] = {}
         for obj_id, html_content in html_objects.items():
-            # Remove HTML tags for content length check
-            text_content = re.sub(r'<[^>]+>', '', html_content)
-            word_count = len(text_content.split())
+            word_count = word_counts.get(html_content)
+            if word_count is None:
+                # Remove HTML tags for content length check. Splitting stops once
+                # the minimum is reached, so the count is exact only below it,
+                # which is the only time it is reported
+                text_content = _HTML_TAG_RE.sub('', html_content)
+                word_count = len(text_content.split(None, _MIN_PAGE_WORDS - 1))
+                word_counts[html_content] = word_count
             
-            if word_count < 50:  # Minimum content requirement
+            total += 1
+            if word_count < _MIN_PAGE_WORDS:  # Minimum content requirement
                 print(f"❌ WARNING: Insufficient content in {obj_id}: {word_count} words")
-                validation_results.append(False)
             else:
-                validation_results.append(True)
+                passed += 1
         
         # 4. Directory structure validation
         course_path = course_structure.get('path')
         if course_path:
             required_files = ['course_info.md']
+            if course_path not in directory_names:
+                directory_names[course_path] = _directory_names(course_path)
+            course_names = directory_names[course_path]
             for req_file in required_files:
-                if not (course_path / req_file).exists():
+                total += 1
+                if req_file not in course_names:
                     print(f"❌ ERROR: Required file missing: {req_file}")
-                    validation_results.append(False)
                 else:
-                    validation_results.append(True)
+                    passed += 1
         
-        success_rate = sum(validation_results) / len(validation_results) if validation_results else 0.0
-        print(f"Pre-flight validation: {success_rate:.1%} checks passed ({sum(validation_results)}/{len(validation_results)})")
+        success_rate = passed / total if total else 0.0
+        print(f"Pre-flight validation: {success_rate:.1%} checks passed ({passed}/{total})")
         
         if success_rate < 0.9:  # Require 90% pass rate
             print("❌ CRITICAL: Pre-flight validation failed - aborting package generation")
@@ -1408,45 +1924,44 @@ This package was generated using the enhanced Brightspace Package Generator with
         if not self.content_accuracy_check:
             return True
         
-        # Remove HTML tags and normalize text for comparison
-        clean_html = re.sub(r'<[^>]+>', '', html_content)
-        clean_html = re.sub(r'\s+', ' ', clean_html.lower().strip())
+        # Remove HTML tags and normalize text for comparison. split() drops
+        # the same whitespace that strip() and \s+ do, so each side is
+        # tokenized once and the normalized text is the tokens rejoined
+        html_tokens = _HTML_TAG_RE.sub('', html_content).lower().split()
+        clean_html = " ".join(html_tokens)
         
-        source_content = re.sub(r'\s+', ' ', source_content.lower().strip())
+        source_tokens = source_content.lower().split()
+        clean_source = " ".join(source_tokens)
         
         # Multi-layered validation approach
         
         # 1. Word overlap analysis
-        source_words = set(w for w in source_content.split() if len(w) > 3)  # Meaningful words only
-        html_words = set(w for w in clean_html.split() if len(w) > 3)
+        source_words = frozenset(w for w in source_tokens if len(w) > 3)  # Meaningful words only
+        html_words = frozenset(w for w in html_tokens if len(w) > 3)
         
-        word_overlap = len(source_words.intersection(html_words))
+        word_overlap = len(source_words & html_words)
         word_overlap_ratio = word_overlap / len(source_words) if source_words else 0
         
-        # 2. Phrase similarity analysis (2-gram overlap)
-        source_bigrams = set()
-        html_bigrams = set()
-        
-        source_tokens = source_content.split()
-        html_tokens = clean_html.split()
-        
-        for i in range(len(source_tokens) - 1):
-            source_bigrams.add(f"{source_tokens[i]} {source_tokens[i+1]}")
+        # 2. Phrase similarity analysis (2-gram overlap). Tokens hold no
+        # whitespace, so token pairs compare exactly like the joined phrases
+        source_bigrams = frozenset(zip(source_tokens, itertools.islice(source_tokens, 1, None)))
+        html_bigrams = frozenset(zip(html_tokens, itertools.islice(html_tokens, 1, None)))
         
-        for i in range(len(html_tokens) - 1):
-            html_bigrams.add(f"{html_tokens[i]} {html_tokens[i+1]}")
-        
-        phrase_overlap = len(source_bigrams.intersection(html_bigrams))
+        phrase_overlap = len(source_bigrams & html_bigrams)
         phrase_overlap_ratio = phrase_overlap / len(source_bigrams) if source_bigrams else 0
         
         # 3. Content length validation
-        source_length = len(source_content)
+        source_length = len(clean_source)
         html_length = len(clean_html)
         length_ratio = html_length / source_length if source_length > 0 else 1
         
-        # 4. Key concept detection
-        key_concepts = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', source_content)
-        concepts_in_html = sum(1 for concept in key_concepts if concept.lower() in clean_html)
+        # 4. Key concept detection. Concepts are capitalized phrases, so they
+        # are found in the original-case source; each distinct one is then
+        # lowercased and whitespace-normalized once to match clean_html
+        key_concepts = frozenset(
+            " ".join(concept.lower().split()) for concept in _KEY_CONCEPT_RE.findall(source_content)
+        )
+        concepts_in_html = sum(1 for concept in key_concepts if concept in clean_html)
         concept_transfer_ratio = concepts_in_html / len(key_concepts) if key_concepts else 1
         
         # Overall accuracy score (weighted average)
@@ -1473,12 +1988,14 @@ This package was generated using the enhanced Brightspace Package Generator with
             print("❌ Content accuracy validation FAILED - insufficient content transfer")
             return False
     
-    def validate_schema_compliance(self, manifest_xml: str) -> bool:
+    def validate_schema_compliance(self, manifest_xml: Optional[str] = None, manifest_root=None) -> bool:
         """
         Validate XML schema compliance (Debug Pattern 1 Fix)
         
         Args:
-            manifest_xml: Generated manifest XML content
+            manifest_xml: Generated manifest XML content, parsed once here
+            manifest_root: lxml manifest element to check in memory instead;
+                lxml guarantees well-formedness, so no parsing is needed
             
         Returns:
             bool: True if schema compliant
@@ -1490,21 +2007,22 @@ This package was generated using the enhanced Brightspace Package Generator with
         required_namespace = self.imscc_namespace
         required_version = self.imscc_version
         
-        if required_namespace not in manifest_xml:
+        # Check for basic XML structure; the checks below read the parsed root
+        if manifest_root is None:
+            try:
+                manifest_root = ET.fromstring(manifest_xml)
+            except ET.ParseError as e:
+                print(f"ERROR: Invalid XML structure: {e}")
+                return False
+        
+        if not manifest_root.tag.startswith(f"{{{required_namespace}}}"):
             print(f"ERROR: Missing required namespace: {required_namespace}")
             return False
             
-        if f'version="{required_version}"' not in manifest_xml:
+        if manifest_root.get("version") != required_version:
             print(f"ERROR: Missing or incorrect version declaration: {required_version}")
             return False
         
-        # Check for basic XML structure
-        try:
-            ET.fromstring(manifest_xml)
-        except ET.ParseError as e:
-            print(f"ERROR: Invalid XML structure: {e}")
-            return False
-        
         return True
     
     def _escape_xml(self, text: str) -> str:
@@ -1519,15 +2037,23 @@ This package was generated using the enhanced Brightspace Package Generator with
         """
         if not text:
             return ""
-        # Escape XML special characters
-        text = text.replace("&", "&amp;")
-        text = text.replace("<", "&lt;")
-        text = text.replace(">", "&gt;")
-        text = text.replace('"', "&quot;")
-        text = text.replace("'", "&apos;")
+        # Escape XML special characters ('&' first). The membership tests are
+        # cheap scans that skip the copy replace() makes when a character is
+        # absent, which is the common case for titles and instructions.
+        if "&" in text:
+            text = text.replace("&", "&amp;")
+        if "<" in text:
+            text = text.replace("<", "&lt;")
+        if ">" in text:
+            text = text.replace(">", "&gt;")
+        if '"' in text:
+            text = text.replace('"', "&quot;")
+        if "'" in text:
+            text = text.replace("'", "&apos;")
         return text
 
-    def _get_assessment_module(self, assessment_id: str, course_structure: Dict) -> int:
+    def _get_assessment_module(self, assessment_id: str, course_structure: Dict,
+                               module_index: Optional[Dict[str, Dict]] = None) -> int:
         """
         Determine which module an assessment belongs to.
 
@@ -1539,20 +2065,23 @@ This package was generated using the enhanced Brightspace Package Generator with
         Args:
             assessment_id: The assessment identifier
             course_structure: Parsed course structure
+            module_index: Assessment id to module map from
+                _index_module_assessments, built here when not given
 
         Returns:
             int: Module number (1-indexed)
         """
         # Strategy 1: Parse week/module number from assessment_id
-        week_match = re.search(r'(?:week|module)[_-]?(\d+)', assessment_id, re.IGNORECASE)
+        week_match = _WEEK_MODULE_RE.search(assessment_id)
         if week_match:
             return int(week_match.group(1))
 
         # Strategy 2: Check course_structure for explicit assignment
-        for module in course_structure.get('modules', []):
-            module_assessments = module.get('assessments', [])
-            if assessment_id in module_assessments:
-                return int(module.get('number', 1))
+        if module_index is None:
+            module_index = _index_module_assessments(course_structure.get('modules', []))
+        module = module_index.get(assessment_id)
+        if module is not None:
+            return int(module.get('number', 1))
 
         # Strategy 3: Default to last module (common pattern for final assessments)
         num_modules = len(course_structure.get('modules', []))
@@ -1570,7 +2099,7 @@ This package was generated using the enhanced Brightspace Package Generator with
             str: Assessment title extracted from XML, or formatted assessment_id as fallback
         """
         # Try to extract title from XML content
-        title_match = re.search(r'<title>([^<]+)</title>', xml_content)
+        title_match = _ASSESSMENT_TITLE_RE.search(xml_content)
         if title_match:
             return title_match.group(1)
 
@@ -1603,26 +2132,15 @@ This package was generated using the enhanced Brightspace Package Generator with
         """
         obj_id_lower = obj_id.lower()
 
-        if 'overview' in obj_id_lower:
-            return (0, obj_id)
-        elif 'objectives' in obj_id_lower:
-            return (1, obj_id)
-        elif 'content' in obj_id_lower:
-            # Extract content number for proper ordering
-            content_match = re.search(r'content[_-]?(\d+)', obj_id_lower)
-            content_num = int(content_match.group(1)) if content_match else 0
-            return (2, content_num, obj_id)
-        elif 'summary' in obj_id_lower:
-            return (3, obj_id)
-        elif 'selfcheck' in obj_id_lower or 'self_check' in obj_id_lower:
-            return (4, obj_id)
-        elif 'discussion' in obj_id_lower:
-            return (5, obj_id)
-        elif 'assignment' in obj_id_lower:
-            return (6, obj_id)
-        elif 'quiz' in obj_id_lower:
-            return (7, obj_id)
-        return (8, obj_id)
+        for keyword, priority in _CONTENT_SORT_KEYWORDS:
+            if keyword in obj_id_lower:
+                if priority == _CONTENT_PRIORITY:
+                    # Extract content number for proper ordering
+                    content_match = _CONTENT_NUM_RE.search(obj_id_lower)
+                    content_num = int(content_match.group(1)) if content_match else 0
+                    return (priority, content_num, obj_id)
+                return (priority, obj_id)
+        return (_CONTENT_SORT_LAST, obj_id)
 
     def remove_hardcoded_references(self, content: str) -> str:
         """
@@ -1637,16 +2155,15 @@ This package was generated using the enhanced Brightspace Package Generator with
         if not self.remove_hardcoded_refs:
             return content
         
-        # Common hardcoded reference patterns
-        patterns_to_remove = [
-            r'See textbook chapter \d+',
-            r'Reference: [^.]+textbook[^.]*\.',
-            r'As discussed in the course textbook',
-            r'Chapter \d+ of the assigned reading'
-        ]
-        
-        for pattern in patterns_to_remove:
-            content = re.sub(pattern, '', content, flags=re.IGNORECASE)
+        # Common hardcoded reference patterns. A removal can join text into
+        # a new occurrence of a later pattern's word, so the lowercased copy
+        # is refreshed whenever something was removed
+        content_lower = content.lower()
+        for literal, pattern in _HARDCODED_REF_RES:
+            if literal in content_lower:
+                content, removed = pattern.subn('', content)
+                if removed:
+                    content_lower = content.lower()
         
         return content.strip()
     
@@ -1665,36 +2182,37 @@ This package was generated using the enhanced Brightspace Package Generator with
         
         print("Running pre-flight validation checks...")
         
-        validation_results = []
+        passed = total = 0
         
         # Check 1: Minimum content requirements
         for module in course_structure.get('modules', []):
             content_length = len(module.get('content', ''))
+            total += 1
             if content_length < self.content_min_length:
                 print(f"WARNING: Module '{module.get('title', 'Unknown')}' has insufficient content ({content_length} chars)")
-                validation_results.append(False)
             else:
-                validation_results.append(True)
+                passed += 1
         
         # Check 2: Assessment content validation
         assessments = course_structure.get('assessments', {})
+        total += 1
         if not assessments:
             print("WARNING: No assessments found in course structure")
-            validation_results.append(False)
         else:
-            validation_results.append(True)
+            passed += 1
         
         # Check 3: Required files exist
         required_files = ['course_info.md']
         course_path = course_structure.get('path')
+        course_names = _directory_names(course_path) if course_path else frozenset()
         for req_file in required_files:
-            if not (course_path / req_file).exists():
+            total += 1
+            if req_file not in course_names:
                 print(f"ERROR: Required file missing: {req_file}")
-                validation_results.append(False)
             else:
-                validation_results.append(True)
+                passed += 1
         
-        success_rate = sum(validation_results) / len(validation_results) if validation_results else 0
+        success_rate = passed / total if total else 0
         print(f"Pre-flight validation: {success_rate:.1%} checks passed")
         
         return success_rate >= 0.8  # Require 80% pass rate
@@ -1710,21 +2228,21 @@ This package was generated using the enhanced Brightspace Package Generator with
         Returns:
             Dict[str, str]: Package generation results with file paths
         """
-        import logging
         logging.basicConfig(level=logging.CRITICAL)
         
         print(f"Starting Brightspace package generation for: {firstdraft_path}")
         print("ENFORCING SINGLE EXECUTION RULE - Agent will execute EXACTLY ONCE")
         
         # MANDATORY: Single execution lock mechanism
+        # The lock is created exclusively, so checking for and taking it is
+        # one atomic step that two processes cannot both pass
         lock_file = self.exports_path / f".generation_lock_{self.timestamp}"
-        if lock_file.exists():
+        try:
+            os.close(os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+        except FileExistsError:
             raise SystemExit("SINGLE EXECUTION VIOLATION: Another generation process is already running")
         
         try:
-            # Create execution lock
-            lock_file.touch()
-            
             # Create export directory first with collision detection
             export_dir = self.create_export_directory()
             print(f"Export directory created: {export_dir}")
@@ -1784,14 +2302,29 @@ This package was generated using the enhanced Brightspace Package Generator with
         except Exception as e:
             # Clean up on any failure
             self._cleanup_temp_files()
-            import logging
             logging.critical(f"GENERATION FAILED: {e}")
             raise SystemExit(f"Package generation failed: {e}")
             
         finally:
             # Always remove execution lock
-            if lock_file.exists():
-                lock_file.unlink(missing_ok=True)
+            lock_file.unlink(missing_ok=True)
+
+
+def _render_module_in_worker(module: Dict, config: Dict) -> Tuple[Dict[str, str], str]:
+    """
+    Render one module in a worker process
+    
+    The packager holds unpicklable state (its identifier counter), so workers
+    are sent the settings from _render_config() and build their own. Console
+    output is captured and returned so the caller can print it in order.
+    """
+    packager = BrightspacePackager(project_root=config['project_root'])
+    packager.content_accuracy_check = config['content_accuracy_check']
+    packager.remove_hardcoded_refs = config['remove_hardcoded_refs']
+    packager.enable_pre_flight_checks = config['enable_pre_flight_checks']
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        module_objects = packager._render_module(module)
+    return module_objects, output.getvalue()
 
 
 def main():
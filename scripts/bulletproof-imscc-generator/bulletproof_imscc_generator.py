@@ -18,14 +18,22 @@ Version: 2.0.0 (Bulletproof Edition)
 Created: 2025-08-05 (Emergency Response)
 """
 
+import html
 import zipfile
 import uuid
 import sys
 import os
 import shutil
+import stat
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
+
+# Package compression. The manifest is small, highly repetitive XML, so the
+# fastest deflate level costs almost nothing in size, and below the store
+# threshold deflate saves too little to be worth running at all
+_ZIP_COMPRESS_LEVEL = 1  # zlib BEST_SPEED
+_ZIP_STORE_THRESHOLD = 4096  # bytes
 
 class BulletproofIMSCCGenerator:
     """
@@ -39,20 +47,40 @@ class BulletproofIMSCCGenerator:
         """Initialize with strict enforcement protocols."""
         self.execution_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         self.temp_files = []
-        self.created_paths = []
+        self.created_paths: List[Path] = []
         
     def emergency_cleanup(self):
         """Emergency cleanup of all created files and directories."""
+        # Messages are collected in order and written in one call
+        messages = []
         for path in self.created_paths:
             try:
-                if Path(path).exists():
-                    if Path(path).is_file():
-                        Path(path).unlink()
-                    elif Path(path).is_dir():
-                        shutil.rmtree(path)
-                    print(f"🧹 Emergency cleanup: {path}")
+                # One lstat answers both existence and type; a symlink is
+                # removed itself rather than followed
+                if stat.S_ISDIR(path.lstat().st_mode):
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+                messages.append(f"🧹 Emergency cleanup: {path}")
+            except FileNotFoundError:
+                continue
             except Exception as e:
-                print(f"⚠️  Cleanup warning: {path} - {e}")
+                messages.append(f"⚠️  Cleanup warning: {path} - {e}")
+        if messages:
+            sys.stdout.write("\n".join(messages) + "\n")
+            sys.stdout.flush()
+    
+    def _scan_parent(self, output_file: Path) -> List[os.DirEntry]:
+        """
+        List the entries beside output_file whose names start with its stem.
+        
+        Both the pre-flight and the post-write Pattern 7 checks work from this
+        one directory read. DirEntry answers is_dir() from the listing itself,
+        without a stat of its own.
+        """
+        stem = output_file.stem
+        with os.scandir(output_file.parent) as entries:
+            return [entry for entry in entries if entry.name.startswith(stem)]
     
     def validate_zero_pattern7_violations(self, output_path: str) -> bool:
         """
@@ -74,32 +102,38 @@ class BulletproofIMSCCGenerator:
             self.emergency_cleanup()
             raise SystemExit(f"ZERO TOLERANCE VIOLATION: File is not a valid ZIP: {output_path}")
         
-        # Check 3: NO directories with the same base name
-        potential_dirs = [
-            output_file.with_suffix(''),  # linear_algebra_course
-            output_parent / f"{output_file.stem}",  # Same as above but explicit
-        ]
+        # Checks 3-5 share one listing of the parent directory, with names
+        # matched by plain prefix/suffix tests
+        stem = output_file.stem
+        name = output_file.name
+        base_dir_exists = False
+        numbered_matches: List[List[Path]] = [[], [], []]  # "{stem} (*)", "{stem}_*", "{stem}(*)"
+        target_matches = []
+        for entry in self._scan_parent(output_file):
+            variant = entry.name[len(stem):]
+            if not variant:
+                base_dir_exists = entry.is_dir()
+            if variant.startswith(' (') and variant.endswith(')'):
+                numbered_matches[0].append(output_parent / entry.name)
+            if variant.startswith('_'):
+                numbered_matches[1].append(output_parent / entry.name)
+            if variant.startswith('(') and variant.endswith(')'):
+                numbered_matches[2].append(output_parent / entry.name)
+            if entry.name.startswith(name):
+                target_matches.append(output_parent / entry.name)
         
-        for potential_dir in potential_dirs:
-            if potential_dir.exists() and potential_dir.is_dir():
-                self.emergency_cleanup()
-                raise SystemExit(f"ZERO TOLERANCE VIOLATION: Directory exists: {potential_dir}")
+        # Check 3: NO directories with the same base name
+        if base_dir_exists:
+            self.emergency_cleanup()
+            raise SystemExit(f"ZERO TOLERANCE VIOLATION: Directory exists: {output_parent / stem}")
         
         # Check 4: NO numbered variants
-        numbered_patterns = [
-            f"{output_file.stem} (*)",
-            f"{output_file.stem}_*",
-            f"{output_file.stem}(*)",
-        ]
-        
-        for pattern in numbered_patterns:
-            matches = list(output_parent.glob(pattern))
+        for matches in numbered_matches:
             if matches:
                 self.emergency_cleanup()
                 raise SystemExit(f"ZERO TOLERANCE VIOLATION: Numbered variants found: {matches}")
         
         # Check 5: EXACTLY one file with our target name
-        target_matches = list(output_parent.glob(f"{output_file.name}*"))
         if len(target_matches) != 1 or target_matches[0] != output_file:
             self.emergency_cleanup()
             raise SystemExit(f"ZERO TOLERANCE VIOLATION: Multiple target files: {target_matches}")
@@ -107,61 +141,76 @@ class BulletproofIMSCCGenerator:
         print("✅ ZERO TOLERANCE VALIDATION: PASSED")
         return True
     
-    def create_bulletproof_imscc(self, course_data: Dict[str, Any], output_path: str) -> Dict[str, Any]:
+    def create_bulletproof_imscc(self, course_data: Dict[str, Any],
+                                 output_path: Union[str, os.PathLike],
+                                 compresslevel: int = _ZIP_COMPRESS_LEVEL) -> Dict[str, Any]:
         """
         Create IMSCC with bulletproof single-file enforcement.
         
         This method implements absolute zero-tolerance Pattern 7 prevention.
+        Manifests under _ZIP_STORE_THRESHOLD bytes are stored uncompressed;
+        larger ones are deflated at compresslevel.
         """
         print(f"🛡️  Starting bulletproof IMSCC generation: {output_path}")
         
-        # CRITICAL: Normalize output path
+        # CRITICAL: Normalize output path; output_file is used for all file
+        # operations and output_path is only its string form for reporting
         output_file = Path(output_path)
-        if not output_file.suffix == '.imscc':
+        if output_file.suffix != '.imscc':
             output_file = output_file.with_suffix('.imscc')
-            output_path = str(output_file)
+        output_path = str(output_file)
+        
+        # One listing of the parent serves every pre-flight check below;
+        # stem and name are Path properties, so bind them once
+        output_parent = output_file.parent
+        stem = output_file.stem
+        stem_entries = self._scan_parent(output_file)
         
         # CRITICAL: Pre-flight collision detection
-        if output_file.exists():
+        name = output_file.name
+        if any(entry.name == name for entry in stem_entries):
             raise SystemExit(f"ZERO TOLERANCE: Output collision detected: {output_path}")
         
         # CRITICAL: Check for any existing Pattern 7 violations
-        output_parent = output_file.parent
         existing_violations = []
         
         # Check for base directory
-        base_dir = output_file.with_suffix('')
-        if base_dir.exists():
-            existing_violations.append(str(base_dir))
+        if any(entry.name == stem for entry in stem_entries):
+            existing_violations.append(str(output_parent / stem))
         
         # Check for numbered variants
-        for item in output_parent.iterdir():
-            if item.name.startswith(output_file.stem) and item.is_dir():
-                existing_violations.append(str(item))
+        for entry in stem_entries:
+            if entry.is_dir():
+                existing_violations.append(str(output_parent / entry.name))
         
         if existing_violations:
             raise SystemExit(f"ZERO TOLERANCE: Pre-existing Pattern 7 violations: {existing_violations}")
         
         # Create parent directory if needed
         output_parent.mkdir(parents=True, exist_ok=True)
-        self.created_paths.append(str(output_parent))
         
         # Create temporary working file
         temp_imscc = output_parent / f".temp_{self.execution_id}.imscc"
-        self.created_paths.append(str(temp_imscc))
+        self.created_paths.append(temp_imscc)
         
         try:
             # Generate manifest content
             manifest_content = self.generate_simple_manifest(course_data)
+            manifest_bytes = manifest_content.encode('utf-8')
+            if len(manifest_bytes) < _ZIP_STORE_THRESHOLD:
+                compression = zipfile.ZIP_STORED
+            else:
+                compression = zipfile.ZIP_DEFLATED
             
             # Create ZIP file with ONLY the manifest
-            with zipfile.ZipFile(temp_imscc, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zipf:
-                zipf.writestr('imsmanifest.xml', manifest_content)
+            with zipfile.ZipFile(temp_imscc, 'w', compression, compresslevel=compresslevel) as zipf:
+                zipf.writestr('imsmanifest.xml', manifest_bytes)
                 print("✅ Added manifest to bulletproof IMSCC")
             
-            # Atomic rename to final location
-            temp_imscc.rename(output_file)
-            self.created_paths.append(str(output_file))
+            # Atomic rename to final location; os.replace has the same
+            # overwrite-in-one-step semantics on every platform
+            os.replace(temp_imscc, output_file)
+            self.created_paths.append(output_file)
             
             # CRITICAL: Immediate validation
             self.validate_zero_pattern7_violations(output_path)
@@ -188,7 +237,8 @@ class BulletproofIMSCCGenerator:
     def generate_simple_manifest(self, course_data: Dict[str, Any]) -> str:
         """Generate minimal IMS Common Cartridge manifest."""
         course_id = str(uuid.uuid4())
-        course_title = course_data.get('title', 'Bulletproof IMSCC Course')
+        # Escaped once; the title appears twice in the manifest
+        course_title = html.escape(course_data.get('title', 'Bulletproof IMSCC Course'))
         
         manifest = f'''<?xml version="1.0" encoding="UTF-8"?>
 <manifest identifier="{course_id}" version="1.2.0"
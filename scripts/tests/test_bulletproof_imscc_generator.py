@@ -0,0 +1,95 @@
+"""
+Tests for the Bulletproof IMSCC Generator Module
+Pattern 7 (Folder Multiplication) Prevention Testing
+"""
+
+import pytest
+import sys
+import zipfile
+from pathlib import Path
+
+# Add module path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'bulletproof-imscc-generator'))
+
+try:
+    from bulletproof_imscc_generator import BulletproofIMSCCGenerator
+except ImportError:
+    pytest.skip("bulletproof_imscc_generator module not available", allow_module_level=True)
+
+
+@pytest.fixture
+def package_path(tmp_path):
+    """A valid single-file package in an otherwise empty directory"""
+    path = tmp_path / "course.imscc"
+    with zipfile.ZipFile(path, 'w') as zipf:
+        zipf.writestr('imsmanifest.xml', '<manifest/>')
+    return path
+
+
+class TestPattern7Validation:
+    """Test suite for validate_zero_pattern7_violations"""
+
+    @pytest.mark.unit
+    @pytest.mark.imscc
+    def test_single_package_passes(self, package_path):
+        """Test that a lone package passes validation"""
+        (package_path.parent / "other").mkdir()
+        (package_path.parent / "coursework.txt").write_text("unrelated")
+        assert BulletproofIMSCCGenerator().validate_zero_pattern7_violations(str(package_path))
+
+    @pytest.mark.unit
+    @pytest.mark.imscc
+    def test_same_name_directory_fails(self, package_path):
+        """Test that a directory named like the package stem is rejected"""
+        (package_path.parent / "course").mkdir()
+        with pytest.raises(SystemExit, match="Directory exists"):
+            BulletproofIMSCCGenerator().validate_zero_pattern7_violations(str(package_path))
+
+    @pytest.mark.unit
+    @pytest.mark.imscc
+    @pytest.mark.parametrize("variant", ["course (1)", "course_x", "course(1)"])
+    def test_numbered_variants_fail(self, package_path, variant):
+        """Test that numbered and suffixed variants of the stem are rejected"""
+        (package_path.parent / variant).write_text("copy")
+        with pytest.raises(SystemExit, match="Numbered variants found"):
+            BulletproofIMSCCGenerator().validate_zero_pattern7_violations(str(package_path))
+
+    @pytest.mark.unit
+    @pytest.mark.imscc
+    def test_duplicate_target_fails(self, package_path):
+        """Test that a second file starting with the package name is rejected"""
+        (package_path.parent / "course.imscc.bak").write_text("copy")
+        with pytest.raises(SystemExit, match="Multiple target files"):
+            BulletproofIMSCCGenerator().validate_zero_pattern7_violations(str(package_path))
+
+    @pytest.mark.unit
+    @pytest.mark.imscc
+    def test_missing_target_fails(self, tmp_path):
+        """Test that a missing package is rejected"""
+        with pytest.raises(SystemExit, match="Target file does not exist"):
+            BulletproofIMSCCGenerator().validate_zero_pattern7_violations(str(tmp_path / "course.imscc"))
+
+
+class TestBulletproofGeneration:
+    """Test suite for create_bulletproof_imscc"""
+
+    @pytest.mark.unit
+    @pytest.mark.imscc
+    def test_creates_exactly_one_file(self, tmp_path):
+        """Test that generation leaves only the package behind"""
+        result = BulletproofIMSCCGenerator().create_bulletproof_imscc(
+            {"title": "Course"}, str(tmp_path / "course")
+        )
+        assert result["status"] == "SUCCESS"
+        assert result["output_file"] == str(tmp_path / "course.imscc")
+        assert [p.name for p in tmp_path.iterdir()] == ["course.imscc"]
+
+    @pytest.mark.unit
+    @pytest.mark.imscc
+    def test_pre_existing_variant_blocks_generation(self, tmp_path):
+        """Test that a pre-existing variant directory stops generation untouched"""
+        (tmp_path / "course (1)").mkdir()
+        (tmp_path / "keep.imscc").write_text("unrelated")
+        with pytest.raises(SystemExit, match="Pre-existing Pattern 7 violations"):
+            BulletproofIMSCCGenerator().create_bulletproof_imscc({}, str(tmp_path / "course.imscc"))
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["course (1)", "keep.imscc"]